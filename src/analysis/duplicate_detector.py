@@ -2,56 +2,95 @@
 
 from typing import Any
 
+import numpy as np
+
+from db.connection import cached_for_fs_db
 from db.queries import get_all_persons_with_names
 
-from .name_disambiguation import compute_similarity_score
+from .name_disambiguation import (
+    SimilarityContext,
+    build_similarity_context,
+    score_candidate_pairs,
+)
 
 
-def find_likely_duplicates(threshold: float = 0.85) -> list[dict[str, Any]]:
+def find_likely_duplicates(
+    threshold: float = 0.85, limit: int | None = None
+) -> list[dict[str, Any]]:
     """
     Find persons that are very likely duplicates (high similarity threshold).
 
+    Only persons sharing the exact normalized surname and given name are scored, so
+    the work grows with the size of each name group rather than with the square of
+    the tree. This blocking is stricter than Soundex buckets; phonetic variants are
+    left to detect_name_clusters.
+
     Args:
         threshold: Similarity threshold (0-1, default 0.85 for likely duplicates)
+        limit: Only return this many highest-scoring pairs (all if None)
 
     Returns:
         List of duplicate pairs with similarity scores
     """
-    all_persons = get_all_persons_with_names()
+    all_persons, name_groups, ctx = _name_groups()
+
+    # Check each group, collecting hits as parallel arrays of positions in all_persons
+    first: list[np.ndarray] = []
+    second: list[np.ndarray] = []
+    scores: list[np.ndarray] = []
+    for group in name_groups:
+        # Compare all pairs in this name group
+        members = np.array(group)
+        pairs = score_candidate_pairs([all_persons[k] for k in group], threshold, ctx)
+        first.append(members[pairs.first])
+        second.append(members[pairs.second])
+        scores.append(pairs.scores)
 
-    if len(all_persons) < 2:
+    if not scores:
         return []
 
-    # Group by exact normalized name for fast duplicate detection
-    name_groups: dict[tuple[str, str], list[dict[str, Any]]] = {}
-    for person in all_persons:
-        key = (person.get("normalized_surname", ""), person.get("normalized_given", ""))
-        if key[0] or key[1]:
-            name_groups.setdefault(key, []).append(person)
+    # Rank on the rounded scores that are returned, so pairs showing the same score keep
+    # the order they were found in; result dicts are only built for the returned pairs
+    rounded = np.round(np.concatenate(scores), 3)
+    order = np.argsort(-rounded, kind="stable")[:limit]
+    first_ids = np.concatenate(first)[order].tolist()
+    second_ids = np.concatenate(second)[order].tolist()
 
     duplicates = []
+    for k1, k2, score in zip(first_ids, second_ids, rounded[order].tolist(), strict=True):
+        p1 = all_persons[k1]
+        p2 = all_persons[k2]
+        duplicates.append(
+            {
+                "person1_id": p1["person_id"],
+                "person1_name": p1.get("display_name", "Unknown"),
+                "person2_id": p2["person_id"],
+                "person2_name": p2.get("display_name", "Unknown"),
+                "similarity_score": score,
+            }
+        )
+    return duplicates
 
-    # Check each group
-    for group_persons in name_groups.values():
-        if len(group_persons) < 2:
-            continue
 
-        # Compare all pairs in this name group
-        for i in range(len(group_persons)):
-            for j in range(i + 1, len(group_persons)):
-                p1 = group_persons[i]
-                p2 = group_persons[j]
-
-                score = compute_similarity_score(p1, p2)
-                if score >= threshold:
-                    duplicates.append(
-                        {
-                            "person1_id": p1["person_id"],
-                            "person1_name": p1.get("display_name", "Unknown"),
-                            "person2_id": p2["person_id"],
-                            "person2_name": p2.get("display_name", "Unknown"),
-                            "similarity_score": round(score, 3),
-                        }
-                    )
-
-    return sorted(duplicates, key=lambda x: x["similarity_score"], reverse=True)
+@cached_for_fs_db
+def _name_groups() -> tuple[list[dict[str, Any]], list[list[int]], SimilarityContext]:
+    """
+    Exact-name groups of two or more persons, with the context for scoring them.
+
+    Returns all persons, the groups as positions in that list, and the prefetched
+    facts/relationships. Cached until the database changes, so runs at different
+    thresholds share one grouping and prefetch.
+    """
+    all_persons = get_all_persons_with_names()
+
+    # Group by exact normalized name for fast duplicate detection
+    name_groups: dict[tuple[str, str], list[int]] = {}
+    for position, person in enumerate(all_persons):
+        key = (person.get("normalized_surname", ""), person.get("normalized_given", ""))
+        if key[0] or key[1]:
+            name_groups.setdefault(key, []).append(position)
+    groups = [group for group in name_groups.values() if len(group) > 1]
+
+    # Prefetch facts/relationships once for everyone who will be compared
+    ctx = build_similarity_context(all_persons[k]["person_id"] for group in groups for k in group)
+    return all_persons, groups, ctx
@@ -3,15 +3,147 @@
 Tailored for Spanish/Latin American naming conventions with repeated family names.
 """
 
-from typing import Any
-
-import jellyfish
-from rapidfuzz import fuzz
-
-from db.queries import get_all_persons_with_names, get_parents, get_person_facts, get_spouses
+import itertools
+import multiprocessing
+import os
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, NamedTuple
+
+import numpy as np
+from rapidfuzz import fuzz, process
+from rapidfuzz.distance import JaroWinkler
+
+from db.connection import cached_for_fs_db
+from db.queries import (
+    get_all_persons_with_names,
+    get_facts_bulk,
+    get_parent_names_bulk,
+    get_spouse_names_bulk,
+)
+
+# Largest possible contribution of everything except the name components (birth year,
+# birth place, death year, parents, spouses). Used to prune pairs whose name score alone
+# can never reach the threshold.
+_MAX_BIRTH_YEAR_SCORE = 0.15
+_MAX_NON_NAME_SCORE = _MAX_BIRTH_YEAR_SCORE + 0.10 + 0.10 + 0.10 + 0.05
+
+# Soundex blocks are scored in worker processes once a run has this many candidate
+# pairs; below it, process start-up costs more than it saves
+PARALLEL_MIN_PAIRS = 2_000_000
+
+# Person fields the block scorer reads (everything else comes from the context)
+_SCORING_FIELDS = ("person_id", "normalized_surname", "normalized_given")
+
+# Threads per rapidfuzz cdist call; pool workers use 1 to avoid oversubscription
+_cdist_workers = -1
+
+# Smaller cdist matrices (most duplicate groups and sub-blocks) are scored on the
+# calling thread: starting cdist's threads costs more than the scoring itself
+_CDIST_THREADED_MIN_CELLS = 10_000
+
+
+class SimilarityContext(NamedTuple):
+    """
+    Prefetched per-person data for similarity scoring, laid out as parallel arrays.
 
+    Row positions[person_id] of every field describes that person. Years are 0 when
+    unknown; birth_place_code is -1 when there is no birth place, and two persons share
+    a code exactly when their (lowercased) birth places are equal. parent_name_ids and
+    spouse_name_ids hold each person's relatives' names as integer codes, one row per
+    person padded with -1 to the longest set.
+    """
 
-def compute_similarity_score(person1: dict[str, Any], person2: dict[str, Any]) -> float:
+    positions: dict[str, int]
+    birth_year: np.ndarray  # int16
+    death_year: np.ndarray  # int16
+    birth_sort: np.ndarray  # int64 date_sort of the birth fact
+    birth_place: list[str]
+    birth_place_code: np.ndarray  # int32
+    parent_names: list[frozenset[str]]  # display names of each person's parents
+    spouse_names: list[frozenset[str]]
+    parent_name_ids: np.ndarray  # int32, persons x longest parent set
+    spouse_name_ids: np.ndarray  # int32, persons x longest spouse set
+
+
+def build_similarity_context(
+    person_ids: Iterable[str],
+    facts: dict[str, list[dict[str, Any]]] | None = None,
+    parent_names: dict[str, list[str]] | None = None,
+    spouse_names: dict[str, list[str]] | None = None,
+) -> SimilarityContext:
+    """
+    Prefetch everything compute_similarity_score looks up, for many persons at once.
+
+    Issues one query per table instead of three queries per person per pair, and
+    extracts birth/death years and birth places once per person rather than per pair.
+    Relatives are only compared by name, so only their display names are loaded.
+    Callers that already hold the bulk results (keyed by person ID, as returned by
+    get_facts_bulk, get_parent_names_bulk and get_spouse_names_bulk) can pass them
+    in to skip those queries.
+    """
+    ids = list(dict.fromkeys(person_ids))
+    facts = get_facts_bulk(ids) if facts is None else facts
+    parent_names = get_parent_names_bulk(ids) if parent_names is None else parent_names
+    spouse_names = get_spouse_names_bulk(ids) if spouse_names is None else spouse_names
+
+    n = len(ids)
+    birth_sort = np.zeros(n, dtype=np.int64)
+    death_sort = np.zeros(n, dtype=np.int64)
+    birth_place = []
+    for i, person_id in enumerate(ids):
+        by_type = {f["fact_type"]: f for f in facts[person_id]}
+        birth = by_type.get("Birth") or {}
+        death = by_type.get("Death") or {}
+        birth_sort[i] = birth.get("date_sort") or 0
+        death_sort[i] = death.get("date_sort") or 0
+        birth_place.append((birth.get("place_normalized") or "").lower())
+
+    place_codes: dict[str, int] = {}
+    birth_place_code = np.fromiter(
+        (place_codes.setdefault(place, len(place_codes)) if place else -1 for place in birth_place),
+        dtype=np.int32,
+        count=n,
+    )
+
+    parent_sets = [frozenset(parent_names[pid]) for pid in ids]
+    spouse_sets = [frozenset(spouse_names[pid]) for pid in ids]
+
+    return SimilarityContext(
+        positions={person_id: i for i, person_id in enumerate(ids)},
+        birth_year=(birth_sort // 10000).astype(np.int16),
+        death_year=(death_sort // 10000).astype(np.int16),
+        birth_sort=birth_sort,
+        birth_place=birth_place,
+        birth_place_code=birth_place_code,
+        parent_names=parent_sets,
+        spouse_names=spouse_sets,
+        parent_name_ids=_name_id_matrix(parent_sets),
+        spouse_name_ids=_name_id_matrix(spouse_sets),
+    )
+
+
+def _name_id_matrix(name_sets: list[frozenset[str]]) -> np.ndarray:
+    """Code the names in each set as integers, one row per set, padded with -1."""
+    codes: dict[str, int] = {}
+    width = max((len(names) for names in name_sets), default=0)
+    matrix = np.full((len(name_sets), width), -1, dtype=np.int32)
+    for row, names in enumerate(name_sets):
+        for column, name in enumerate(names):
+            matrix[row, column] = codes.setdefault(name, len(codes))
+    return matrix
+
+
+def _ensure_context(ctx: SimilarityContext | None, person_ids: list[str]) -> SimilarityContext:
+    """Return ctx if it covers every person, otherwise prefetch a context for them."""
+    if ctx is not None and all(person_id in ctx.positions for person_id in person_ids):
+        return ctx
+    return build_similarity_context(person_ids)
+
+
+def compute_similarity_score(
+    person1: dict[str, Any], person2: dict[str, Any], ctx: SimilarityContext | None = None
+) -> float:
     """
     Compute similarity score between two persons (0-1 scale).
 
@@ -24,88 +156,55 @@ def compute_similarity_score(person1: dict[str, Any], person2: dict[str, Any]) -
     - Parent name match: 0.10
     - Spouse name match: 0.05
     - Source overlap: 0.05
+
+    Pass ctx (from build_similarity_context) when scoring many pairs so facts, parents
+    and spouses are not re-queried for every pair.
+    """
+    features = _name_features(person1, person2) + _fact_features(person1, person2, ctx)
+    return _combine_scores(*features)
+
+
+def _combine_scores(
+    surname_eq: bool,
+    surname_fuzz: float,
+    given_jw: float,
+    given_partial: float,
+    birth_y1: int,
+    birth_y2: int,
+    death_y1: int,
+    death_y2: int,
+    place_eq: bool,
+    place_fuzz: float,
+    parent_overlap_ratio: float,
+    spouse_overlap_ratio: float,
+) -> float:
+    """
+    Weighted combination of the per-pair features (arithmetic only, no lookups).
+
+    Similarities are 0-1 and are 0 when either side is missing; years are 0 when unknown.
     """
     score = 0.0
 
-    # Surname match (exact normalized)
-    if person1.get("normalized_surname") and person2.get("normalized_surname"):
-        if person1["normalized_surname"] == person2["normalized_surname"]:
-            score += 0.25
-        else:
-            # Partial credit for similar surnames
-            similarity = (
-                fuzz.ratio(person1["normalized_surname"], person2["normalized_surname"]) / 100
-            )
-            score += 0.25 * similarity
+    # Surname match (exact normalized, partial credit for similar surnames)
+    score += 0.25 if surname_eq else 0.25 * surname_fuzz
 
     # Given name fuzzy match
-    if person1.get("normalized_given") and person2.get("normalized_given"):
-        jw = jellyfish.jaro_winkler_similarity(
-            person1["normalized_given"], person2["normalized_given"]
-        )
-        partial = fuzz.partial_ratio(person1["normalized_given"], person2["normalized_given"]) / 100
-        given_score = (jw + partial) / 2
-        score += 0.20 * given_score
-
-    # Get facts for both persons
-    facts1 = {f["fact_type"]: f for f in get_person_facts(person1["person_id"])}
-    facts2 = {f["fact_type"]: f for f in get_person_facts(person2["person_id"])}
+    score += 0.20 * ((given_jw + given_partial) / 2)
 
     # Birth year proximity
-    birth1 = facts1.get("Birth")
-    birth2 = facts2.get("Birth")
-    if birth1 and birth2 and birth1.get("date_sort") and birth2.get("date_sort"):
-        year1 = birth1["date_sort"] // 10000
-        year2 = birth2["date_sort"] // 10000
-        year_diff = abs(year1 - year2)
-        if year_diff == 0:
-            score += 0.15
-        elif year_diff <= 2:
-            score += 0.15 * (1 - year_diff / 10)
+    if birth_y1 and birth_y2 and abs(birth_y1 - birth_y2) <= 2:
+        score += 0.15 * (1 - abs(birth_y1 - birth_y2) / 10)
 
-    # Birth place match
-    if birth1 and birth2:
-        place1 = (birth1.get("place_normalized") or "").lower()
-        place2 = (birth2.get("place_normalized") or "").lower()
-        if place1 and place2:
-            if place1 == place2:
-                score += 0.10
-            else:
-                # Partial credit for overlapping place components
-                place_sim = fuzz.token_set_ratio(place1, place2) / 100
-                score += 0.10 * place_sim
+    # Birth place match (partial credit for overlapping place components)
+    score += 0.10 if place_eq else 0.10 * place_fuzz
 
     # Death year proximity
-    death1 = facts1.get("Death")
-    death2 = facts2.get("Death")
-    if death1 and death2 and death1.get("date_sort") and death2.get("date_sort"):
-        year1 = death1["date_sort"] // 10000
-        year2 = death2["date_sort"] // 10000
-        year_diff = abs(year1 - year2)
-        if year_diff == 0:
-            score += 0.10
-        elif year_diff <= 2:
-            score += 0.10 * (1 - year_diff / 10)
-
-    # Parent name match
-    parents1 = get_parents(person1["person_id"])
-    parents2 = get_parents(person2["person_id"])
-    if parents1 and parents2:
-        parent_names1 = {p["display_name"] for p in parents1}
-        parent_names2 = {p["display_name"] for p in parents2}
-        overlap = len(parent_names1 & parent_names2)
-        if overlap > 0:
-            score += 0.10 * (overlap / max(len(parent_names1), len(parent_names2)))
-
-    # Spouse name match
-    spouses1 = get_spouses(person1["person_id"])
-    spouses2 = get_spouses(person2["person_id"])
-    if spouses1 and spouses2:
-        spouse_names1 = {s["display_name"] for s in spouses1}
-        spouse_names2 = {s["display_name"] for s in spouses2}
-        overlap = len(spouse_names1 & spouse_names2)
-        if overlap > 0:
-            score += 0.05 * (overlap / max(len(spouse_names1), len(spouse_names2)))
+    if death_y1 and death_y2 and abs(death_y1 - death_y2) <= 2:
+        score += 0.10 * (1 - abs(death_y1 - death_y2) / 10)
+
+    # Parent and spouse name match
+    score += 0.10 * parent_overlap_ratio
+    score += 0.05 * spouse_overlap_ratio
 
     # Note: Source overlap would require loading sources, skipping for now
     # Could add 0.05 here in future
@@ -113,13 +212,306 @@ def compute_similarity_score(person1: dict[str, Any], person2: dict[str, Any]) -
     return min(score, 1.0)
 
 
+def _combine_scores_vec(
+    surname_eq: np.ndarray,
+    surname_fuzz: np.ndarray,
+    given_jw: np.ndarray,
+    given_partial: np.ndarray,
+    birth_y1: np.ndarray,
+    birth_y2: np.ndarray,
+    death_y1: np.ndarray,
+    death_y2: np.ndarray,
+    place_eq: np.ndarray,
+    place_fuzz: np.ndarray,
+    parent_overlap_ratio: np.ndarray,
+    spouse_overlap_ratio: np.ndarray,
+) -> np.ndarray:
+    """
+    _combine_scores over arrays of features, scoring a whole block in one pass.
+
+    Components are added in place, in the same order as _combine_scores, so every pair
+    gets a bit-identical score without a temporary array per addition. (A feature
+    matrix times a weight vector would regroup the sums and could move scores that
+    sit exactly on the threshold.)
+    """
+    score: np.ndarray = np.where(surname_eq, 0.25, 0.25 * surname_fuzz)
+    score += 0.20 * ((given_jw + given_partial) / 2)
+    score += _year_proximity_vec(birth_y1, birth_y2, 0.15)
+    score += np.where(place_eq, 0.10, 0.10 * place_fuzz)
+    score += _year_proximity_vec(death_y1, death_y2, 0.10)
+    score += 0.10 * parent_overlap_ratio
+    score += 0.05 * spouse_overlap_ratio
+    np.minimum(score, 1.0, out=score)
+    return score
+
+
+def _year_proximity_vec(year1: np.ndarray, year2: np.ndarray, weight: float) -> np.ndarray:
+    """Year proximity component for arrays of years (0 = unknown)."""
+    diff = np.abs(year1 - year2)
+    close = (year1 != 0) & (year2 != 0) & (diff <= 2)
+    proximity: np.ndarray = np.where(close, weight * (1 - diff / 10), 0.0)
+    return proximity
+
+
+def _name_features(
+    person1: dict[str, Any], person2: dict[str, Any]
+) -> tuple[bool, float, float, float]:
+    """Surname and given name features: (surname_eq, surname_fuzz, given_jw, given_partial)."""
+    surname_eq = False
+    surname_fuzz = 0.0
+    surname1 = person1.get("normalized_surname")
+    surname2 = person2.get("normalized_surname")
+    if surname1 and surname2:
+        surname_eq = surname1 == surname2
+        if not surname_eq:
+            surname_fuzz = fuzz.ratio(surname1, surname2) / 100
+
+    given_jw = 0.0
+    given_partial = 0.0
+    given1 = person1.get("normalized_given")
+    given2 = person2.get("normalized_given")
+    if given1 and given2:
+        if given1 == given2:
+            # Identical names score 1.0 on both metrics
+            given_jw = given_partial = 1.0
+        else:
+            given_jw = JaroWinkler.similarity(given1, given2)
+            given_partial = fuzz.partial_ratio(given1, given2) / 100
+
+    return surname_eq, surname_fuzz, given_jw, given_partial
+
+
+def _fact_features(
+    person1: dict[str, Any], person2: dict[str, Any], ctx: SimilarityContext | None = None
+) -> tuple[int, int, int, int, bool, float, float, float]:
+    """
+    Birth, death, parent and spouse features.
+
+    Returns:
+        (birth_y1, birth_y2, death_y1, death_y2, place_eq, place_fuzz,
+        parent_overlap_ratio, spouse_overlap_ratio)
+    """
+    ctx = _ensure_context(ctx, [person1["person_id"], person2["person_id"]])
+    i = ctx.positions[person1["person_id"]]
+    j = ctx.positions[person2["person_id"]]
+
+    # Birth place match
+    place_eq = False
+    place_fuzz = 0.0
+    if ctx.birth_place_code[i] >= 0 and ctx.birth_place_code[j] >= 0:
+        place_eq = bool(ctx.birth_place_code[i] == ctx.birth_place_code[j])
+        if not place_eq:
+            place_fuzz = fuzz.token_set_ratio(ctx.birth_place[i], ctx.birth_place[j]) / 100
+
+    return (
+        int(ctx.birth_year[i]),
+        int(ctx.birth_year[j]),
+        int(ctx.death_year[i]),
+        int(ctx.death_year[j]),
+        place_eq,
+        place_fuzz,
+        _name_overlap_ratio(ctx.parent_names[i], ctx.parent_names[j]),
+        _name_overlap_ratio(ctx.spouse_names[i], ctx.spouse_names[j]),
+    )
+
+
+def _name_overlap_ratio(names1: frozenset[str], names2: frozenset[str]) -> float:
+    """Share of relatives' display names two persons have in common (0 if either has none)."""
+    if not names1 or not names2:
+        return 0.0
+    return len(names1 & names2) / max(len(names1), len(names2))
+
+
+def _overlap_ratios(name_ids: np.ndarray, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    _name_overlap_ratio for every (a[k], b[k]) pair of context positions.
+
+    Names within a set are distinct, so the intersection size is the number of matching
+    codes between the two rows; sets hold a handful of names, so comparing every column
+    pair is a few array passes rather than a set intersection per pair.
+    """
+    left = name_ids[a]
+    right = name_ids[b]
+    size_l = (left >= 0).sum(axis=1)
+    size_r = (right >= 0).sum(axis=1)
+    common = np.zeros(len(a), dtype=np.int64)
+    for i in range(name_ids.shape[1]):
+        present = left[:, i] >= 0
+        for j in range(name_ids.shape[1]):
+            common += present & (left[:, i] == right[:, j])
+    largest = np.maximum(size_l, size_r)
+    ratios = np.zeros(len(a))
+    np.divide(common, largest, out=ratios, where=(size_l > 0) & (size_r > 0))
+    return ratios
+
+
+def _distinct_cdist(left: list[str], right: list[str], scorer: Any) -> np.ndarray:
+    """
+    rapidfuzz cdist over the distinct strings only, expanded to the full left x right shape.
+
+    A Soundex block repeats a handful of surnames and common given names many times,
+    so this scores far fewer string pairs than cdist over every person.
+    """
+    distinct_l, inverse_l = np.unique(left, return_inverse=True)
+    distinct_r, inverse_r = np.unique(right, return_inverse=True)
+    small = len(distinct_l) * len(distinct_r) < _CDIST_THREADED_MIN_CELLS
+    scores = process.cdist(
+        distinct_l.tolist(),
+        distinct_r.tolist(),
+        scorer=scorer,
+        dtype=np.float64,
+        workers=1 if small else _cdist_workers,
+    )
+    expanded: np.ndarray = scores[inverse_l[:, None], inverse_r[None, :]]
+    return expanded
+
+
+def _name_feature_matrices(
+    left: list[dict[str, Any]], right: list[dict[str, Any]]
+) -> dict[str, np.ndarray]:
+    """
+    Name features for every (left, right) pair.
+
+    Equivalent to calling _name_features on each pair, but the string metrics run as
+    batched rapidfuzz cdist calls so the n*m loop stays in C.
+    """
+    surnames_l = [p.get("normalized_surname") or "" for p in left]
+    surnames_r = [p.get("normalized_surname") or "" for p in right]
+    givens_l = [p.get("normalized_given") or "" for p in left]
+    givens_r = [p.get("normalized_given") or "" for p in right]
+    shape = (len(left), len(right))
+
+    both_surname = np.outer([bool(s) for s in surnames_l], [bool(s) for s in surnames_r])
+    surname_codes = np.unique(surnames_l + surnames_r, return_inverse=True)[1]
+    codes_l, codes_r = surname_codes[: len(left)], surname_codes[len(left) :]
+    surname_eq = both_surname & (codes_l[:, None] == codes_r[None, :])
+    surname_fuzz = np.zeros(shape)
+    if both_surname.any():
+        ratio = _distinct_cdist(surnames_l, surnames_r, fuzz.ratio)
+        surname_fuzz = np.where(both_surname & ~surname_eq, ratio / 100, 0.0)
+
+    both_given = np.outer([bool(g) for g in givens_l], [bool(g) for g in givens_r])
+    given_jw = np.zeros(shape)
+    given_partial = np.zeros(shape)
+    if both_given.any():
+        jw = _distinct_cdist(givens_l, givens_r, JaroWinkler.similarity)
+        partial = _distinct_cdist(givens_l, givens_r, fuzz.partial_ratio)
+        given_jw = np.where(both_given, jw, 0.0)
+        given_partial = np.where(both_given, partial / 100, 0.0)
+
+    return {
+        "surname_eq": surname_eq,
+        "surname_fuzz": surname_fuzz,
+        "given_jw": given_jw,
+        "given_partial": given_partial,
+    }
+
+
+class CandidatePairs(NamedTuple):
+    """Scored pairs as parallel arrays: indexes of each side and the pair's score."""
+
+    first: np.ndarray  # intp
+    second: np.ndarray  # intp
+    scores: np.ndarray  # float64
+
+    @classmethod
+    def empty(cls) -> "CandidatePairs":
+        return cls(np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp), np.empty(0))
+
+
+def score_candidate_pairs(
+    persons: list[dict[str, Any]],
+    threshold: float,
+    ctx: SimilarityContext | None = None,
+    others: list[dict[str, Any]] | None = None,
+    max_non_name_score: float = _MAX_NON_NAME_SCORE,
+) -> CandidatePairs:
+    """
+    Score every pair within a block of candidate persons.
+
+    Name similarity is computed for the whole block at once; only pairs whose name score
+    could still reach the threshold are scored on facts and relationships.
+
+    Args:
+        persons: Block of candidate persons
+        threshold: Minimum score to keep a pair
+        ctx: Prefetched similarity context (built on demand if missing)
+        others: If given, score every persons x others pair instead of pairs within persons
+        max_non_name_score: Most the non-name components can add for these pairs, used
+            to prune on name score (lower it when a component is known to score 0)
+
+    Returns:
+        CandidatePairs with score >= threshold. first indexes persons; second indexes
+        others if given, otherwise persons.
+    """
+    right = persons if others is None else others
+    n = len(persons)
+    if (others is None and n < 2) or not persons or not right:
+        return CandidatePairs.empty()
+
+    names = _name_feature_matrices(persons, right)
+    if others is None:
+        rows, cols = np.triu_indices(n, k=1)
+    else:
+        rows, cols = (idx.ravel() for idx in np.indices((n, len(others))))
+    name_scores = np.where(
+        names["surname_eq"][rows, cols], 0.25, 0.25 * names["surname_fuzz"][rows, cols]
+    ) + 0.20 * ((names["given_jw"][rows, cols] + names["given_partial"][rows, cols]) / 2)
+    # Small tolerance so float rounding in the bound never drops a pair at the threshold
+    reachable = name_scores + max_non_name_score >= threshold - 1e-9
+
+    # Don't compare person to themselves
+    ids_l = np.array([p["person_id"] for p in persons], dtype=object)
+    ids_r = np.array([p["person_id"] for p in right], dtype=object)
+    reachable &= ids_l[rows] != ids_r[cols]
+    rows = rows[reachable]
+    cols = cols[reachable]
+    if len(rows) == 0:
+        return CandidatePairs.empty()
+
+    # Fact features for all surviving pairs, gathered from the context arrays
+    ctx = _ensure_context(ctx, [p["person_id"] for p in persons + right])
+    a = np.fromiter((ctx.positions[pid] for pid in ids_l), dtype=np.intp, count=n)[rows]
+    b = np.fromiter((ctx.positions[pid] for pid in ids_r), dtype=np.intp, count=len(right))[cols]
+
+    place_a = ctx.birth_place_code[a]
+    place_b = ctx.birth_place_code[b]
+    place_known = (place_a >= 0) & (place_b >= 0)
+    place_eq = place_known & (place_a == place_b)
+    place_fuzz = np.zeros(len(rows))
+    for k in np.flatnonzero(place_known & ~place_eq).tolist():
+        place_fuzz[k] = fuzz.token_set_ratio(ctx.birth_place[a[k]], ctx.birth_place[b[k]]) / 100
+
+    parents = _overlap_ratios(ctx.parent_name_ids, a, b)
+    spouses = _overlap_ratios(ctx.spouse_name_ids, a, b)
+
+    scores = _combine_scores_vec(
+        names["surname_eq"][rows, cols],
+        names["surname_fuzz"][rows, cols],
+        names["given_jw"][rows, cols],
+        names["given_partial"][rows, cols],
+        ctx.birth_year[a],
+        ctx.birth_year[b],
+        ctx.death_year[a],
+        ctx.death_year[b],
+        place_eq,
+        place_fuzz,
+        parents,
+        spouses,
+    )
+
+    hits = scores >= threshold
+    return CandidatePairs(rows[hits], cols[hits], scores[hits])
+
+
 def detect_name_clusters(
     surname_filter: str | None = None, similarity_threshold: float = 0.60
 ) -> list[dict[str, Any]]:
     """
     Detect clusters of potentially confused or duplicate persons.
 
-    Uses Soundex/phonetic blocking to avoid O(n^2) comparisons, then scores pairs.
+    Uses Soundex/phonetic blocking, split by birth decade, to avoid O(n^2) comparisons,
+    then scores pairs.
     Returns list of clusters, each containing list of similar persons.
 
     Args:
@@ -129,101 +521,230 @@ def detect_name_clusters(
     Returns:
         List of clusters, each with: cluster_id, persons (with similarity scores)
     """
-    # Get all persons
-    all_persons = get_all_persons_with_names()
-
-    if surname_filter:
-        all_persons = [
-            p
-            for p in all_persons
-            if p.get("surname") and surname_filter.lower() in p["surname"].lower()
-        ]
+    all_persons, blocks, ctx = _soundex_blocks(surname_filter)
 
     if len(all_persons) < 2:
         return []
 
+    # Find similar pairs within each block (blocks never share a pair)
+    pairs = [
+        pair
+        for block_pairs in _score_blocks(blocks, similarity_threshold, ctx)
+        for pair in block_pairs
+    ]
+
+    # Cluster using Union-Find
+    clusters = _cluster_pairs(pairs, all_persons, ctx)
+
+    return clusters
+
+
+@cached_for_fs_db
+def _soundex_blocks(
+    surname_filter: str | None,
+) -> tuple[list[dict[str, Any]], list[list[dict[str, Any]]], SimilarityContext]:
+    """
+    Soundex surname blocks of two or more persons, with the context for scoring them.
+
+    Returns all persons, the blocks and the prefetched facts/relationships. Cached
+    until the database changes, so runs at different thresholds share one blocking
+    and prefetch.
+    """
+    all_persons = get_all_persons_with_names(surname_filter)
+
     # Block by Soundex surname (avoids comparing everyone with everyone)
     soundex_blocks: dict[str, list[dict[str, Any]]] = {}
     for person in all_persons:
         soundex = person.get("soundex_surname", "")
         if soundex:
             soundex_blocks.setdefault(soundex, []).append(person)
+    blocks = [block for block in soundex_blocks.values() if len(block) > 1]
 
-    # Find similar pairs within each block
-    similar_pairs: list[tuple[str, str, float]] = []
+    # Prefetch facts/relationships once for everyone who will be compared
+    ctx = build_similarity_context(p["person_id"] for block in blocks for p in block)
+    return all_persons, blocks, ctx
 
-    for block_persons in soundex_blocks.values():
-        if len(block_persons) < 2:
-            continue
 
-        for i in range(len(block_persons)):
-            for j in range(i + 1, len(block_persons)):
-                p1 = block_persons[i]
-                p2 = block_persons[j]
+def _score_blocks(
+    blocks: list[list[dict[str, Any]]], threshold: float, ctx: SimilarityContext
+) -> list[list[tuple[str, str, float]]]:
+    """
+    Score each Soundex block, in worker processes when there is enough work.
 
-                # Don't compare person to themselves
-                if p1["person_id"] == p2["person_id"]:
-                    continue
+    Blocks are independent, so large runs fan out over a process pool. Each worker
+    receives the similarity context once, through the pool initializer, and then only
+    the name fields of each block it scores. A run that is itself in a worker process
+    (e.g. a report bundle worker) scores in process rather than nest a second pool.
+    """
+    workers = os.cpu_count() or 1
+    comparisons = sum(len(block) * (len(block) - 1) // 2 for block in blocks)
+    in_worker = multiprocessing.parent_process() is not None
+    if workers < 2 or comparisons < PARALLEL_MIN_PAIRS or in_worker:
+        return [_score_block(block, threshold, ctx) for block in blocks]
+
+    name_fields = [
+        [{key: person.get(key) for key in _SCORING_FIELDS} for person in block] for block in blocks
+    ]
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(blocks)),
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_block_worker,
+        initargs=(ctx,),
+    ) as pool:
+        return list(
+            pool.map(_score_block_in_worker, name_fields, itertools.repeat(threshold), chunksize=4)
+        )
 
-                score = compute_similarity_score(p1, p2)
-                if score >= similarity_threshold:
-                    similar_pairs.append((p1["person_id"], p2["person_id"], score))
 
-    # Cluster using Union-Find
-    clusters = _cluster_pairs(similar_pairs, all_persons)
+def _score_block(
+    block: list[dict[str, Any]], threshold: float, ctx: SimilarityContext
+) -> list[tuple[str, str, float]]:
+    """Similar (person1_id, person2_id, score) pairs within one Soundex block."""
+    # Keyed by sorted ID pair, since a person listed twice in a block repeats a pair
+    similar_pairs: dict[tuple[str, str], float] = {}
+    for left, right, max_non_name_score in _candidate_sub_blocks(block, ctx):
+        others = left if right is None else right
+        first, second, scores = score_candidate_pairs(
+            left, threshold, ctx, right, max_non_name_score=max_non_name_score
+        )
+        for i, j, score in zip(first.tolist(), second.tolist(), scores.tolist(), strict=True):
+            id1, id2 = left[i]["person_id"], others[j]["person_id"]
+            similar_pairs[(id1, id2) if id1 < id2 else (id2, id1)] = score
+    return [(id1, id2, score) for (id1, id2), score in similar_pairs.items()]
 
-    return clusters
+
+_worker_ctx: SimilarityContext | None = None
+
+
+def _init_block_worker(ctx: SimilarityContext) -> None:
+    """Process pool initializer: keep the context, and let each worker use one thread."""
+    global _worker_ctx, _cdist_workers
+    _worker_ctx = ctx
+    _cdist_workers = 1
+
+
+def _score_block_in_worker(
+    block: list[dict[str, Any]], threshold: float
+) -> list[tuple[str, str, float]]:
+    """Pool task: score one block against the context set by _init_block_worker."""
+    if _worker_ctx is None:
+        raise RuntimeError("block worker used without _init_block_worker")
+    return _score_block(block, threshold, _worker_ctx)
+
+
+def _candidate_sub_blocks(
+    block: list[dict[str, Any]], ctx: SimilarityContext
+) -> Iterator[tuple[list[dict[str, Any]], list[dict[str, Any]] | None, float]]:
+    """
+    Split a Soundex block into smaller groups to score.
+
+    Yields (persons, others, max_non_name_score) arguments for score_candidate_pairs,
+    covering every pair in the block exactly once. Persons are blocked on birth decade:
+    each decade is compared with itself and the next one, so births a couple of years
+    apart across a decade boundary still meet. Decades further apart are compared too,
+    but since births more than two years apart earn no birth-year score, those pairs
+    are only scored in full when their name score alone could still reach the
+    threshold. Persons with no birth year are compared with the whole block.
+    """
+    by_decade: dict[int, list[dict[str, Any]]] = {}
+    unknown_year: list[dict[str, Any]] = []
+    for person in block:
+        year = int(ctx.birth_year[ctx.positions[person["person_id"]]])
+        if year:
+            by_decade.setdefault(year // 10, []).append(person)
+        else:
+            unknown_year.append(person)
+
+    decades = sorted(by_decade)
+    for k, decade in enumerate(decades):
+        persons = by_decade[decade]
+        yield persons, None, _MAX_NON_NAME_SCORE
+        if decade + 1 in by_decade:
+            yield persons, by_decade[decade + 1], _MAX_NON_NAME_SCORE
+        distant = [p for later in decades[k + 1 :] if later > decade + 1 for p in by_decade[later]]
+        if distant:
+            yield persons, distant, _MAX_NON_NAME_SCORE - _MAX_BIRTH_YEAR_SCORE
+
+    if unknown_year:
+        yield unknown_year, None, _MAX_NON_NAME_SCORE
+        known_year = [p for persons in by_decade.values() for p in persons]
+        if known_year:
+            yield unknown_year, known_year, _MAX_NON_NAME_SCORE
 
 
 def _cluster_pairs(
-    pairs: list[tuple[str, str, float]], all_persons: list[dict[str, Any]]
+    pairs: list[tuple[str, str, float]],
+    all_persons: list[dict[str, Any]],
+    ctx: SimilarityContext | None = None,
 ) -> list[dict[str, Any]]:
-    """Group similar pairs into clusters using Union-Find."""
+    """
+    Group similar pairs into clusters using Union-Find.
+
+    Each cluster's representative is its member that comes first in all_persons, so
+    clusters do not depend on the order the pairs were found in. Members are scored
+    against the representative, and clusters of equal size are listed in the order of
+    their representatives.
+    """
     if not pairs:
         return []
 
-    # Union-Find parent mapping
-    parent: dict[str, str] = {}
-
-    def find(x: str) -> str:
-        if x not in parent:
-            parent[x] = x
-        if parent[x] != x:
-            parent[x] = find(parent[x])  # Path compression
-        return parent[x]
-
-    def union(x: str, y: str):
-        px, py = find(x), find(y)
-        if px != py:
-            parent[px] = py
-
-    # Build clusters
+    # Factorize person IDs, in all_persons order, so Union-Find runs on integer indexes
+    position: dict[str, int] = {}
+    for p in all_persons:
+        position.setdefault(p["person_id"], len(position))
+    pair_ids = {pid for p1_id, p2_id, _score in pairs for pid in (p1_id, p2_id)}
+    ids = sorted(pair_ids, key=lambda pid: position[pid])
+    index = {pid: k for k, pid in enumerate(ids)}
+    n = len(ids)
+
+    # Union-Find over plain int lists: element access on NumPy arrays is slower than
+    # on lists from Python code, and the scalar loop is the hot path here
+    parent = list(range(n))
+    rank = [0] * n
+
+    def find(x: int) -> int:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]  # Path halving
+            x = parent[x]
+        return x
+
+    # Build clusters (union by rank)
     for p1_id, p2_id, _score in pairs:
-        union(p1_id, p2_id)
-
-    # Group by root
-    cluster_members: dict[str, list[str]] = {}
-    for person_id in parent.keys():
-        root = find(person_id)
-        cluster_members.setdefault(root, []).append(person_id)
+        root_x, root_y = find(index[p1_id]), find(index[p2_id])
+        if root_x == root_y:
+            continue
+        if rank[root_x] < rank[root_y]:
+            root_x, root_y = root_y, root_x
+        parent[root_y] = root_x
+        if rank[root_x] == rank[root_y]:
+            rank[root_x] += 1
+
+    # Group by root; each group lists its members in index order, so its first member
+    # is the representative, and groups are ordered by representative
+    roots = np.fromiter((find(x) for x in range(n)), dtype=np.int32, count=n)
+    _, labels = np.unique(roots, return_inverse=True)
+    by_label = np.argsort(labels, kind="stable")
+    groups = np.split(by_label, np.cumsum(np.bincount(labels))[:-1])
+    groups.sort(key=lambda members: int(members[0]))
 
     # Build output
     person_map = {p["person_id"]: p for p in all_persons}
     result = []
 
-    for cluster_id, (root, members) in enumerate(cluster_members.items()):
+    for cluster_id, members in enumerate(groups):
         if len(members) < 2:
             continue
 
+        root = ids[int(members[0])]
         cluster_persons = []
-        for member_id in members:
+        for member_id in (ids[m] for m in members.tolist()):
             person = person_map.get(member_id)
             if person:
                 # Compute score vs representative (root)
                 if member_id == root:
                     score = 1.0
                 else:
-                    score = compute_similarity_score(person_map[root], person)
+                    score = compute_similarity_score(person_map[root], person, ctx)
 
                 cluster_persons.append(
                     {
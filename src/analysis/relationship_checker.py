@@ -1,59 +1,217 @@
 """Relationship structure validation: detect circular ancestry and structural issues."""
 
-from typing import Any
+from collections import deque
+from collections.abc import Iterator
+from typing import Any, NamedTuple
 
-from db.queries import get_children, get_parents, get_spouses
+import numpy as np
 
+from db.connection import cached_for_fs_db
+from db.queries import (
+    get_all_parent_edges,
+    get_children_bulk,
+    get_parents,
+    get_parents_bulk,
+    get_spouses,
+    get_spouses_bulk,
+)
 
-def detect_circular_ancestry(person_id: str, max_depth: int = 20) -> list[dict[str, Any]]:
+
+class ParentGraph(NamedTuple):
+    """Child -> parent edges in CSR form, with persons indexed 0..n-1."""
+
+    ids: list[str]
+    positions: dict[str, int]
+    indptr: np.ndarray  # parents of node i are indices[indptr[i]:indptr[i + 1]]
+    indices: np.ndarray
+    reaches_cycle: np.ndarray  # True if a circular ancestry is reachable via parents
+
+
+@cached_for_fs_db
+def load_parent_graph() -> ParentGraph:
     """
-    Detect circular ancestry (person is their own ancestor).
+    Load every parent edge in one query and find circular ancestry in O(V+E).
+
+    The graph is cached until the database changes.
 
-    Uses DFS with cycle detection.
+    Cycles are strongly connected components (size > 1, or a self-parent edge) found
+    with an iterative Tarjan pass; reaches_cycle then marks every person with a
+    cycle among their ancestors.
     """
-    issues = []
-    visited: set[str] = set()
-    path: list[str] = []
+    edges = get_all_parent_edges()
+    ids = list(dict.fromkeys(pid for edge in edges for pid in edge))
+    index = {pid: i for i, pid in enumerate(ids)}
+    n = len(ids)
 
-    def dfs(current_id: str, depth: int) -> bool:
-        if depth > max_depth:
-            return False
+    child_idx = np.fromiter((index[c] for c, _ in edges), dtype=np.int32, count=len(edges))
+    parent_idx = np.fromiter((index[p] for _, p in edges), dtype=np.int32, count=len(edges))
+    indptr, indices = _to_csr(child_idx, parent_idx, n)
 
-        if current_id in path:
-            # Found a cycle
-            cycle_start = path.index(current_id)
-            cycle = path[cycle_start:] + [current_id]
-            issues.append(
-                {
-                    "type": "circular_ancestry",
-                    "severity": "critical",
-                    "person_id": person_id,
-                    "description": f"Circular ancestry detected: {' -> '.join(cycle)}",
-                    "cycle": cycle,
-                }
-            )
-            return True
+    cyclic = _cyclic_nodes(indptr, indices)
+    cyclic[child_idx[child_idx == parent_idx]] = True
 
-        if current_id in visited:
-            return False
+    # Everyone descended from a cyclic node can reach the cycle through their parents
+    child_indptr, child_indices = _to_csr(parent_idx, child_idx, n)
+    reaches_cycle = cyclic.copy()
+    to_visit = deque(np.flatnonzero(cyclic).tolist())
+    while to_visit:
+        node = to_visit.popleft()
+        for child in child_indices[child_indptr[node] : child_indptr[node + 1]].tolist():
+            if not reaches_cycle[child]:
+                reaches_cycle[child] = True
+                to_visit.append(child)
 
-        visited.add(current_id)
-        path.append(current_id)
+    return ParentGraph(ids, index, indptr, indices, reaches_cycle)
 
-        # Check parents
-        parents = get_parents(current_id)
-        for parent in parents:
-            if dfs(parent["person_id"], depth + 1):
-                return True
 
-        path.pop()
-        return False
+def _to_csr(src: np.ndarray, dst: np.ndarray, n: int) -> tuple[np.ndarray, np.ndarray]:
+    """Build CSR (indptr, indices) arrays for edges src -> dst, keeping edge order."""
+    order = np.argsort(src, kind="stable")
+    indptr = np.zeros(n + 1, dtype=np.int32)
+    np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+    return indptr, dst[order]
+
+
+def _cyclic_nodes(indptr: np.ndarray, indices: np.ndarray) -> np.ndarray:
+    """Mark nodes in a strongly connected component of size > 1 (iterative Tarjan)."""
+    n = len(indptr) - 1
+    ptr = indptr.tolist()
+    adj = indices.tolist()
+    order = [-1] * n
+    low = [0] * n
+    on_stack = [False] * n
+    stack: list[int] = []
+    cyclic = np.zeros(n, dtype=bool)
+    counter = 0
+
+    for root in range(n):
+        if order[root] != -1:
+            continue
+        order[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, ptr[root])]
+
+        while work:
+            node, edge = work[-1]
+            if edge < ptr[node + 1]:
+                work[-1] = (node, edge + 1)
+                nxt = adj[edge]
+                if order[nxt] == -1:
+                    order[nxt] = low[nxt] = counter
+                    counter += 1
+                    stack.append(nxt)
+                    on_stack[nxt] = True
+                    work.append((nxt, ptr[nxt]))
+                elif on_stack[nxt]:
+                    low[node] = min(low[node], order[nxt])
+                continue
+
+            work.pop()
+            if work:
+                caller = work[-1][0]
+                low[caller] = min(low[caller], low[node])
+            if low[node] == order[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = False
+                    component.append(member)
+                    if member == node:
+                        break
+                if len(component) > 1:
+                    cyclic[component] = True
+
+    return cyclic
+
+
+def _graph_parents(graph: ParentGraph, person_id: str) -> Iterator[str]:
+    """Iterate the parent IDs of a person from the preloaded graph."""
+    i = graph.positions.get(person_id)
+    if i is None:
+        return iter(())
+    return (graph.ids[p] for p in graph.indices[graph.indptr[i] : graph.indptr[i + 1]].tolist())
 
-    dfs(person_id, 0)
-    return issues
+
+def detect_circular_ancestry(
+    person_id: str, max_depth: int = 20, graph: ParentGraph | None = None
+) -> list[dict[str, Any]]:
+    """
+    Detect circular ancestry (person is their own ancestor).
+
+    Uses the preloaded parent graph to skip persons with no cycle among their ancestors,
+    then an iterative DFS to report the concrete cycle. Pass graph (from
+    load_parent_graph) when checking many persons.
+    """
+    graph = graph if graph is not None else load_parent_graph()
+    i = graph.positions.get(person_id)
+    if i is None or not graph.reaches_cycle[i]:
+        return []
+
+    cycle = _find_cycle(graph, person_id, max_depth)
+    if cycle is None:
+        # The first pass never searches a person twice, so one first reached along a
+        # long path can hide a cycle that a shorter path would reach within max_depth
+        cycle = _find_cycle(graph, person_id, max_depth, revisit_shallower=True)
+    if cycle is None:
+        return []
+    return [
+        {
+            "type": "circular_ancestry",
+            "severity": "critical",
+            "person_id": person_id,
+            "description": f"Circular ancestry detected: {' -> '.join(cycle)}",
+            "cycle": cycle,
+        }
+    ]
 
 
-def check_relationship_structure(person_id: str) -> list[dict[str, Any]]:
+def _find_cycle(
+    graph: ParentGraph, person_id: str, max_depth: int, revisit_shallower: bool = False
+) -> list[str] | None:
+    """
+    Depth-limited iterative DFS up the ancestry; returns the first cycle found.
+
+    Each person is searched once, unless revisit_shallower is set, in which case a
+    person is searched again whenever they are reached at a smaller depth than before.
+    """
+    path: list[str] = []
+    position: dict[str, int] = {}  # person -> index in path, for O(1) cycle checks
+    visited: dict[str, int] = {}  # person -> smallest depth searched from
+    stack: list[tuple[Iterator[str], int]] = []
+
+    def enter(current_id: str, depth: int) -> list[str] | None:
+        if depth > max_depth:
+            return None
+        if current_id in position:
+            # Found a cycle
+            return path[position[current_id] :] + [current_id]
+        if current_id in visited and (not revisit_shallower or visited[current_id] <= depth):
+            return None
+        visited[current_id] = depth
+        position[current_id] = len(path)
+        path.append(current_id)
+        stack.append((_graph_parents(graph, current_id), depth))
+        return None
+
+    cycle = enter(person_id, 0)
+    while stack and cycle is None:
+        parents, depth = stack[-1]
+        parent_id = next(parents, None)
+        if parent_id is None:
+            stack.pop()
+            del position[path.pop()]
+            continue
+        cycle = enter(parent_id, depth + 1)
+    return cycle
+
+
+def check_relationship_structure(
+    person_id: str,
+    parents: list[dict[str, Any]] | None = None,
+    spouses: list[dict[str, Any]] | None = None,
+) -> list[dict[str, Any]]:
     """
     Check for structural issues in relationships.
 
@@ -61,11 +219,14 @@ def check_relationship_structure(person_id: str) -> list[dict[str, Any]]:
     - Person has more than 2 biological parents
     - Spouse relationships without gender distinction
     - Multiple marriages with overlapping dates
+
+    Prefetched parents/spouses may be passed in to avoid querying them again.
     """
     issues = []
 
     # Check parent count
-    parents = get_parents(person_id)
+    if parents is None:
+        parents = get_parents(person_id)
     if len(parents) > 2:
         issues.append(
             {
@@ -99,7 +260,8 @@ def check_relationship_structure(person_id: str) -> list[dict[str, Any]]:
         )
 
     # Check spouse relationships
-    spouses = get_spouses(person_id)
+    if spouses is None:
+        spouses = get_spouses(person_id)
     if len(spouses) > 1:
         # Check for overlapping marriage dates
         marriages = []
@@ -130,30 +292,37 @@ def validate_relationships_for_tree(
 
     Checks circular ancestry and structural issues for all persons in the tree.
     """
+    graph = load_parent_graph()
+
     # Collect all person IDs in tree (BFS from root)
-    to_visit = [root_person_id]
+    to_visit = deque([root_person_id])
     visited: set[str] = set()
     all_issues = []
 
     while to_visit and len(visited) < max_persons:
-        current = to_visit.pop(0)
-        if current in visited:
-            continue
-        visited.add(current)
-
-        # Check for issues
-        all_issues.extend(detect_circular_ancestry(current))
-        all_issues.extend(check_relationship_structure(current))
-
-        # Add relatives to visit
-        for parent in get_parents(current):
-            if parent["person_id"] not in visited:
-                to_visit.append(parent["person_id"])
-        for child in get_children(current):
-            if child["person_id"] not in visited:
-                to_visit.append(child["person_id"])
-        for spouse in get_spouses(current):
-            if spouse["person_id"] not in visited:
-                to_visit.append(spouse["person_id"])
+        # Prefetch relatives for the whole frontier: three queries per BFS layer
+        layer = [pid for pid in dict.fromkeys(to_visit) if pid not in visited]
+        parents = get_parents_bulk(layer)
+        children = get_children_bulk(layer)
+        spouses = get_spouses_bulk(layer)
+
+        for _ in range(len(to_visit)):
+            if len(visited) >= max_persons:
+                break
+            current = to_visit.popleft()
+            if current in visited:
+                continue
+            visited.add(current)
+
+            # Check for issues
+            all_issues.extend(detect_circular_ancestry(current, graph=graph))
+            all_issues.extend(
+                check_relationship_structure(current, parents[current], spouses[current])
+            )
+
+            # Add relatives to visit
+            for relative in parents[current] + children[current] + spouses[current]:
+                if relative["person_id"] not in visited:
+                    to_visit.append(relative["person_id"])
 
     return all_issues
@@ -1,12 +1,17 @@
 """Analyze source coverage and identify persons/events missing sources."""
 
+import heapq
+from collections import deque
 from typing import Any
 
+from db.connection import lru_cached_for_fs_db
 from db.queries import (
-    get_parents,
+    get_facts_bulk,
+    get_parents_bulk,
     get_person_by_id,
     get_person_facts,
     get_person_sources,
+    get_sources_bulk,
 )
 
 
@@ -17,13 +22,18 @@ def analyze_person_source_coverage(person_id: str) -> dict[str, Any]:
     Returns:
         Dict with total_sources, facts_with_sources, facts_without_sources, priority_score
     """
-    person = get_person_by_id(person_id)
+    return _source_coverage(
+        get_person_by_id(person_id), get_person_facts(person_id), get_person_sources(person_id)
+    )
+
+
+def _source_coverage(
+    person: dict[str, Any] | None, facts: list[dict[str, Any]], sources: list[dict[str, Any]]
+) -> dict[str, Any]:
+    """Compute the analyze_person_source_coverage result from already loaded rows."""
     if not person:
         return {}
 
-    sources = get_person_sources(person_id)
-    facts = get_person_facts(person_id)
-
     # Map sources to fact types
     source_tags = {s["tag"] for s in sources if s.get("tag")}
 
@@ -41,7 +51,7 @@ def analyze_person_source_coverage(person_id: str) -> dict[str, Any]:
     important_without_sources = [f for f in important_events if f["fact_type"] not in source_tags]
 
     return {
-        "person_id": person_id,
+        "person_id": person["person_id"],
         "person_name": person["display_name"],
         "total_sources": len(sources),
         "total_facts": len(facts),
@@ -54,7 +64,10 @@ def analyze_person_source_coverage(person_id: str) -> dict[str, Any]:
     }
 
 
-def prioritize_source_research(root_person_id: str, generations: int = 4) -> list[dict[str, Any]]:
+@lru_cached_for_fs_db(32)
+def prioritize_source_research(
+    root_person_id: str, generations: int = 4, limit: int | None = None
+) -> list[dict[str, Any]]:
     """
     Generate prioritized list of persons needing source research.
 
@@ -63,61 +76,86 @@ def prioritize_source_research(root_person_id: str, generations: int = 4) -> lis
     - Number of vital facts without sources
     - Total number of facts without sources
 
+    Args:
+        root_person_id: Person to start from
+        generations: Number of ancestor generations to include
+        limit: Only return this many top-priority persons (all if None)
+
     Returns:
-        Sorted list of persons with priority scores
+        Sorted list of persons with priority scores. Results are cached until the
+        database changes, so back-to-back reports on one tree walk it only once.
     """
     # BFS to collect persons by generation
-    to_visit = [(root_person_id, 0)]
+    to_visit = deque([(root_person_id, 0)])
     visited = set()
     person_priorities = []
 
+    # Person rows: the root's, then each parent row as the BFS climbs
+    root = get_person_by_id(root_person_id)
+    persons = {root_person_id: root} if root else {}
+
     while to_visit:
-        current_id, gen = to_visit.pop(0)
-        if current_id in visited or gen > generations:
-            continue
-        visited.add(current_id)
-
-        # Analyze coverage
-        coverage = analyze_person_source_coverage(current_id)
-        if not coverage:
-            continue
-
-        # Calculate priority score
-        # Closer generation = higher base score
-        generation_score = (generations - gen + 1) * 10
-
-        # More missing vital facts = higher score
-        vital_missing_score = coverage["vital_facts_without_sources"] * 5
-
-        # More missing important facts = moderate score
-        important_missing_score = coverage["important_facts_without_sources"] * 2
-
-        # No sources at all = bonus
-        no_sources_bonus = 10 if coverage["total_sources"] == 0 else 0
-
-        priority_score = (
-            generation_score + vital_missing_score + important_missing_score + no_sources_bonus
-        )
-
-        if priority_score > 0:
-            person_priorities.append(
-                {
-                    "person_id": current_id,
-                    "person_name": coverage["person_name"],
-                    "generation": gen,
-                    "priority_score": priority_score,
-                    "total_sources": coverage["total_sources"],
-                    "vital_missing": coverage["vital_facts_without_sources"],
-                    "important_missing": coverage["important_facts_without_sources"],
-                    "missing_events": [f["fact_type"] for f in coverage["missing_vital_events"]]
-                    + [f["fact_type"] for f in coverage["missing_important_events"]],
-                }
+        # Prefetch coverage data for the whole generation: three queries per BFS layer
+        layer_gen = to_visit[0][1]
+        layer = [
+            pid for pid, gen in dict.fromkeys(to_visit) if pid not in visited and gen <= generations
+        ]
+        facts = get_facts_bulk(layer)
+        sources = get_sources_bulk(layer)
+        parents = get_parents_bulk(layer if layer_gen < generations else [])
+
+        for _ in range(len(to_visit)):
+            current_id, gen = to_visit.popleft()
+            if current_id in visited or gen > generations:
+                continue
+            visited.add(current_id)
+
+            # Analyze coverage
+            coverage = _source_coverage(
+                persons.get(current_id), facts[current_id], sources[current_id]
             )
+            if not coverage:
+                continue
 
-        # Add parents to visit
-        parents = get_parents(current_id)
-        for parent in parents:
-            if parent["person_id"] not in visited:
-                to_visit.append((parent["person_id"], gen + 1))
+            # Calculate priority score
+            # Closer generation = higher base score
+            generation_score = (generations - gen + 1) * 10
+
+            # More missing vital facts = higher score
+            vital_missing_score = coverage["vital_facts_without_sources"] * 5
+
+            # More missing important facts = moderate score
+            important_missing_score = coverage["important_facts_without_sources"] * 2
+
+            # No sources at all = bonus
+            no_sources_bonus = 10 if coverage["total_sources"] == 0 else 0
+
+            priority_score = (
+                generation_score + vital_missing_score + important_missing_score + no_sources_bonus
+            )
 
+            if priority_score > 0:
+                person_priorities.append(
+                    {
+                        "person_id": current_id,
+                        "person_name": coverage["person_name"],
+                        "generation": gen,
+                        "priority_score": priority_score,
+                        "total_sources": coverage["total_sources"],
+                        "vital_missing": coverage["vital_facts_without_sources"],
+                        "important_missing": coverage["important_facts_without_sources"],
+                        "missing_events": [f["fact_type"] for f in coverage["missing_vital_events"]]
+                        + [f["fact_type"] for f in coverage["missing_important_events"]],
+                    }
+                )
+
+            # Add parents to visit
+            for parent in parents.get(current_id, []):
+                persons.setdefault(parent["person_id"], parent)
+                if parent["person_id"] not in visited:
+                    to_visit.append((parent["person_id"], gen + 1))
+
+    if limit is not None:
+        # Same order as the full sort, without sorting the persons that are cut
+        return heapq.nlargest(limit, person_priorities, key=lambda x: x["priority_score"])
     return sorted(person_priorities, key=lambda x: x["priority_score"], reverse=True)
@@ -2,8 +2,22 @@
 
 from typing import Any
 
-from db.connection import get_fs_db
-from db.queries import get_parents, get_person_by_id, get_person_facts
+import numpy as np
+
+from db.queries import (
+    get_all_parent_edges,
+    get_all_persons,
+    get_facts_bulk,
+    get_parents,
+    get_person_by_id,
+    get_vital_facts,
+)
+
+# Plausibility limits, in years
+MAX_AGE_AT_DEATH = 120
+MIN_PARENT_AGE = 13
+MAX_MOTHER_AGE = 60
+MAX_FATHER_AGE = 80
 
 
 def validate_person_timeline(person_id: str) -> list[dict[str, Any]]:
@@ -17,124 +31,198 @@ def validate_person_timeline(person_id: str) -> list[dict[str, Any]]:
     - Parent ages (too young/old)
     - Children ages (too young/old)
     """
-    issues: list[dict[str, Any]] = []
     person = get_person_by_id(person_id)
     if not person:
-        return issues
+        return []
+
+    parents = get_parents(person_id)
+    facts = {
+        pid: {f["fact_type"]: f for f in person_facts}
+        for pid, person_facts in get_facts_bulk(
+            [person_id] + [p["person_id"] for p in parents]
+        ).items()
+    }
+    return _timeline_issues(person, parents, facts)
+
+
+def _timeline_issues(
+    person: dict[str, Any],
+    parents: list[dict[str, Any]],
+    facts: dict[str, dict[str, dict[str, Any]]],
+) -> list[dict[str, Any]]:
+    """
+    Run the timeline checks for one person against already loaded data.
 
-    facts = {f["fact_type"]: f for f in get_person_facts(person_id)}
-    birth = facts.get("Birth")
-    death = facts.get("Death")
+    Args:
+        person: Person row
+        parents: Parent person rows
+        facts: Facts keyed by person ID, then fact type, for the person and parents
+    """
+    issues: list[dict[str, Any]] = []
+    birth = facts.get(person["person_id"], {}).get("Birth")
+    death = facts.get(person["person_id"], {}).get("Death")
 
     # Check birth before death
     if birth and death:
         birth_sort = birth.get("date_sort")
         death_sort = death.get("date_sort")
         if birth_sort and death_sort and birth_sort > death_sort:
-            issues.append(
-                {
-                    "type": "death_before_birth",
-                    "severity": "critical",
-                    "person_id": person_id,
-                    "person_name": person["display_name"],
-                    "description": f"Death date ({death['date_original']}) is before birth date ({birth['date_original']})",
-                }
-            )
+            issues.append(_death_before_birth_issue(person, birth, death))
 
         # Age at death plausibility
         if birth_sort and death_sort:
             age = (death_sort // 10000) - (birth_sort // 10000)
-            if age < 0:
-                # Already caught above
-                pass
-            elif age > 120:
-                issues.append(
-                    {
-                        "type": "implausible_age_at_death",
-                        "severity": "warning",
-                        "person_id": person_id,
-                        "person_name": person["display_name"],
-                        "description": f"Age at death ({age} years) exceeds 120 years",
-                    }
-                )
+            if age > MAX_AGE_AT_DEATH:
+                issues.append(_age_at_death_issue(person, age))
 
     # Check parent ages at birth of this child
     if birth and birth.get("date_sort"):
-        parents = get_parents(person_id)
         for parent in parents:
-            parent_facts = {f["fact_type"]: f for f in get_person_facts(parent["person_id"])}
-            parent_birth = parent_facts.get("Birth")
+            parent_birth = facts.get(parent["person_id"], {}).get("Birth")
             if parent_birth and parent_birth.get("date_sort"):
                 parent_birth_year = parent_birth["date_sort"] // 10000
                 child_birth_year = birth["date_sort"] // 10000
-                parent_age_at_birth = child_birth_year - parent_birth_year
-
-                if parent_age_at_birth < 13:
-                    issues.append(
-                        {
-                            "type": "parent_too_young",
-                            "severity": "critical",
-                            "person_id": person_id,
-                            "person_name": person["display_name"],
-                            "parent_id": parent["person_id"],
-                            "parent_name": parent["display_name"],
-                            "description": f"Parent {parent['display_name']} was only {parent_age_at_birth} years old at child's birth",
-                        }
-                    )
-                elif parent_age_at_birth > 60 and parent.get("gender") == "Female":
-                    issues.append(
-                        {
-                            "type": "mother_too_old",
-                            "severity": "warning",
-                            "person_id": person_id,
-                            "person_name": person["display_name"],
-                            "parent_id": parent["person_id"],
-                            "parent_name": parent["display_name"],
-                            "description": f"Mother {parent['display_name']} was {parent_age_at_birth} years old at child's birth (unusual but possible)",
-                        }
-                    )
-                elif parent_age_at_birth > 80 and parent.get("gender") == "Male":
-                    issues.append(
-                        {
-                            "type": "father_too_old",
-                            "severity": "warning",
-                            "person_id": person_id,
-                            "person_name": person["display_name"],
-                            "parent_id": parent["person_id"],
-                            "parent_name": parent["display_name"],
-                            "description": f"Father {parent['display_name']} was {parent_age_at_birth} years old at child's birth (unusual but possible)",
-                        }
-                    )
+                issue = _parent_age_issue(person, parent, child_birth_year - parent_birth_year)
+                if issue:
+                    issues.append(issue)
 
     return issues
 
 
+def _death_before_birth_issue(
+    person: dict[str, Any], birth: dict[str, Any], death: dict[str, Any]
+) -> dict[str, Any]:
+    return {
+        "type": "death_before_birth",
+        "severity": "critical",
+        "person_id": person["person_id"],
+        "person_name": person["display_name"],
+        "description": f"Death date ({death['date_original']}) is before birth date ({birth['date_original']})",
+    }
+
+
+def _age_at_death_issue(person: dict[str, Any], age: int) -> dict[str, Any]:
+    return {
+        "type": "implausible_age_at_death",
+        "severity": "warning",
+        "person_id": person["person_id"],
+        "person_name": person["display_name"],
+        "description": f"Age at death ({age} years) exceeds {MAX_AGE_AT_DEATH} years",
+    }
+
+
+def _parent_age_issue(
+    person: dict[str, Any], parent: dict[str, Any], parent_age_at_birth: int
+) -> dict[str, Any] | None:
+    """Issue for a parent's age at the person's birth, or None if it is plausible."""
+    if parent_age_at_birth < MIN_PARENT_AGE:
+        issue_type, severity = "parent_too_young", "critical"
+        description = f"Parent {parent['display_name']} was only {parent_age_at_birth} years old at child's birth"
+    elif parent_age_at_birth > MAX_MOTHER_AGE and parent.get("gender") == "Female":
+        issue_type, severity = "mother_too_old", "warning"
+        description = f"Mother {parent['display_name']} was {parent_age_at_birth} years old at child's birth (unusual but possible)"
+    elif parent_age_at_birth > MAX_FATHER_AGE and parent.get("gender") == "Male":
+        issue_type, severity = "father_too_old", "warning"
+        description = f"Father {parent['display_name']} was {parent_age_at_birth} years old at child's birth (unusual but possible)"
+    else:
+        return None
+
+    return {
+        "type": issue_type,
+        "severity": severity,
+        "person_id": person["person_id"],
+        "person_name": person["display_name"],
+        "parent_id": parent["person_id"],
+        "parent_name": parent["display_name"],
+        "description": description,
+    }
+
+
 def validate_all_timelines(min_severity: str = "warning") -> list[dict[str, Any]]:
     """
     Validate timelines for all persons in cache.
 
+    Runs the same checks as validate_person_timeline, but as array operations over
+    every person and parent edge at once.
+
     Args:
         min_severity: Minimum severity to include ('critical', 'warning', 'info')
 
     Returns:
         List of timeline issues
     """
-    conn = get_fs_db()
-    cursor = conn.execute("SELECT person_id FROM persons")
-    person_ids = [row["person_id"] for row in cursor.fetchall()]
-
-    all_issues = []
-    for person_id in person_ids:
-        issues = validate_person_timeline(person_id)
-        all_issues.extend(issues)
-
-    # Filter by severity
+    # Checks below min_severity are skipped outright rather than filtered afterwards
     severity_order = {"info": 0, "warning": 1, "critical": 2}
     min_level = severity_order.get(min_severity, 1)
-    filtered = [i for i in all_issues if severity_order.get(i["severity"], 0) >= min_level]
+    warnings = min_level <= severity_order["warning"]
+
+    # Load everything the checks need in three scans instead of per-person queries
+    persons = get_all_persons()
+    position = {person["person_id"]: i for i, person in enumerate(persons)}
+    facts = get_vital_facts()
+
+    def date_sorts(fact_type: str) -> np.ndarray:
+        # 0 when the fact or its date_sort is missing; YYYYMMDD fits in int32
+        sorts: np.ndarray = np.fromiter(
+            (
+                (facts.get(person["person_id"], {}).get(fact_type) or {}).get("date_sort") or 0
+                for person in persons
+            ),
+            dtype=np.int32,
+            count=len(persons),
+        )
+        return sorts
+
+    birth_sort = date_sorts("Birth")
+    death_sort = date_sorts("Death")
+    birth_year = birth_sort // 10000
+
+    # Issues are collected per person, in validate_person_timeline's order
+    issues_by_person: dict[int, list[dict[str, Any]]] = {}
+
+    def vital(i: int, fact_type: str) -> dict[str, Any]:
+        return facts[persons[i]["person_id"]][fact_type]
+
+    both_dated = (birth_sort != 0) & (death_sort != 0)
+    for i in np.flatnonzero(both_dated & (birth_sort > death_sort)).tolist():
+        issues_by_person.setdefault(i, []).append(
+            _death_before_birth_issue(persons[i], vital(i, "Birth"), vital(i, "Death"))
+        )
+
+    if warnings:
+        age_at_death = death_sort // 10000 - birth_year
+        for i in np.flatnonzero(both_dated & (age_at_death > MAX_AGE_AT_DEATH)).tolist():
+            issues_by_person.setdefault(i, []).append(
+                _age_at_death_issue(persons[i], int(age_at_death[i]))
+            )
+
+    # Parent ages, over every child -> parent edge between known persons
+    edges = [
+        (position[child_id], position[parent_id])
+        for child_id, parent_id in get_all_parent_edges()
+        if child_id in position and parent_id in position
+    ]
+    edge_array = np.array(edges, dtype=np.intp).reshape(-1, 2)
+    child, parent = edge_array[:, 0], edge_array[:, 1]
+    parent_age = birth_year[child] - birth_year[parent]
+    out_of_range = parent_age < MIN_PARENT_AGE
+    if warnings:
+        female = np.array([person.get("gender") == "Female" for person in persons], dtype=bool)
+        male = np.array([person.get("gender") == "Male" for person in persons], dtype=bool)
+        out_of_range |= (parent_age > MAX_MOTHER_AGE) & female[parent]
+        out_of_range |= (parent_age > MAX_FATHER_AGE) & male[parent]
+
+    flagged = (birth_sort[child] != 0) & (birth_sort[parent] != 0) & out_of_range
+    for k in np.flatnonzero(flagged).tolist():
+        c, p = int(child[k]), int(parent[k])
+        issue = _parent_age_issue(persons[c], persons[p], int(parent_age[k]))
+        if issue:
+            issues_by_person.setdefault(c, []).append(issue)
+
+    all_issues = [issue for i in sorted(issues_by_person) for issue in issues_by_person[i]]
 
     return sorted(
-        filtered,
+        all_issues,
         key=lambda x: (severity_order.get(x["severity"], 0), x.get("person_name", "")),
         reverse=True,
     )
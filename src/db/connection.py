@@ -1,7 +1,19 @@
 """Database connection module for accessing both FamilySearch and research sources caches."""
 
+import contextlib
+import functools
+import os
 import sqlite3
+import threading
+import weakref
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterator
+from contextvars import ContextVar
 from pathlib import Path
+from typing import ParamSpec, TypeVar
+
+P = ParamSpec("P")
+R = TypeVar("R")
 
 # Database paths
 FS_CACHE_PATH = (
@@ -14,34 +26,298 @@ SOURCES_CACHE_PATH = (
     / "sources-cache.sqlite"
 )
 
-_fs_conn: sqlite3.Connection | None = None
-_sources_conn: sqlite3.Connection | None = None
+# Analysis is read-heavy: a large page cache plus memory-mapped I/O keep repeated
+# lookups off the disk, and temp b-trees for ORDER BY/DISTINCT stay in memory.
+# query_only guards against accidental writes through the shared connection.
+FS_PRAGMAS = (
+    "PRAGMA mmap_size=268435456",  # 256 MB
+    "PRAGMA cache_size=-262144",  # 256 MB
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA query_only=1",
+)
+
+# The research sources cache is small and only ever looked up by key, so it keeps
+# SQLite's default page cache and just gets the in-memory temp store and write guard.
+SOURCES_PRAGMAS = (
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA query_only=1",
+)
+
+# Indexes for the lookups analysis runs per person: facts by person in date order,
+# parent edges from either side (covering, so edge scans never touch the table),
+# couples from either side, names by person, and source refs by person and tag
+# (covering the unsourced-fact NOT EXISTS probe). Surname substring searches cannot
+# seek, but scanning the narrow (surname, person_id) index beats scanning the table.
+FS_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_analyzer_facts_person ON facts(person_id, date_sort)",
+    "CREATE INDEX IF NOT EXISTS idx_analyzer_pcr_child"
+    " ON parent_child_relationships(child_id, parent_id)",
+    "CREATE INDEX IF NOT EXISTS idx_analyzer_pcr_parent"
+    " ON parent_child_relationships(parent_id, child_id)",
+    "CREATE INDEX IF NOT EXISTS idx_analyzer_couple_p1 ON couple_relationships(person1_id)",
+    "CREATE INDEX IF NOT EXISTS idx_analyzer_couple_p2 ON couple_relationships(person2_id)",
+    "CREATE INDEX IF NOT EXISTS idx_analyzer_names_person ON person_names(person_id, name_type)",
+    "CREATE INDEX IF NOT EXISTS idx_analyzer_names_surname ON person_names(surname, person_id)",
+    "CREATE INDEX IF NOT EXISTS idx_analyzer_source_refs_person_tag"
+    " ON person_source_refs(person_id, tag)",
+)
+
+# The cache databases belong to familysearch-mcp and research-sources-mcp, and by
+# default this server only ever opens them read-only. Setting the environment
+# variable TREE_ANALYZER_PREPARE_CACHE=1 opts in to switching them to WAL and adding
+# FS_INDEXES, which speeds up large trees at the cost of writing to their schema.
+PREPARE_CACHE_DATABASES = os.environ.get("TREE_ANALYZER_PREPARE_CACHE") == "1"
+
+# Prepared statements kept per connection. Bulk getters build one statement per
+# IN (...) size (a power of two, see queries._chunked): about a dozen shapes each,
+# which would churn sqlite3's default cache of 128 and evict the per-person lookups
+# that every analysis repeats.
+STATEMENT_CACHE_SIZE = 256
+
+# Connections are per thread so analysis can run on worker threads. Each entry on
+# _local is a _ThreadConnection; close_connections() bumps the generation so every
+# thread reopens on its next call. When a thread exits its entries are dropped, and a
+# finalizer closes their connections. The lock is reentrant because that finalizer
+# can run from garbage collection while this thread already holds it.
+_local = threading.local()
+_lock = threading.RLock()
+_open_connections: list[sqlite3.Connection] = []
+_generation = 0
+_prepared: set[Path] = set()
+# clear() of every cache made by _version_cache, for clear_query_caches()
+_cache_clearers: list[Callable[[], None]] = []
+
+
+def _prepare(path: Path, statements: tuple[str, ...] = ()) -> None:
+    """
+    Switch a cache database to WAL and run setup statements, once per process.
+
+    Does nothing unless PREPARE_CACHE_DATABASES is set. WAL lets our readers run
+    alongside the cache writer. The journal mode and any indexes are persistent, so
+    these are the only writes we make. Statements that fail (e.g. a table this cache
+    version lacks, or a busy writer) are skipped, as is the whole step if the file
+    cannot be opened read-write; the read-only open then reports any real error.
+    """
+    if not PREPARE_CACHE_DATABASES:
+        return
+    with _lock:
+        if path in _prepared:
+            return
+        try:
+            conn = sqlite3.connect(f"{path.resolve().as_uri()}?mode=rw", uri=True)
+        except sqlite3.OperationalError:
+            return
+        try:
+            for statement in ("PRAGMA journal_mode=WAL", *statements):
+                try:
+                    conn.execute(statement)
+                except sqlite3.OperationalError:
+                    continue
+            conn.commit()
+        finally:
+            conn.close()
+        _prepared.add(path)
+
+
+def _open_read_only(
+    path: Path, pragmas: tuple[str, ...] = (), setup: tuple[str, ...] = ()
+) -> sqlite3.Connection:
+    """Open a read-only connection that may be shared with worker threads."""
+    _prepare(path, setup)
+    conn = sqlite3.connect(
+        f"{path.resolve().as_uri()}?mode=ro",
+        uri=True,
+        check_same_thread=False,
+        cached_statements=STATEMENT_CACHE_SIZE,
+    )
+    conn.row_factory = sqlite3.Row
+    for pragma in pragmas:
+        conn.execute(pragma)
+    return conn
+
+
+class _ThreadConnection:
+    """A thread's connection to one database, as stored on _local."""
+
+    __slots__ = ("conn", "path", "generation", "__weakref__")
+
+    def __init__(self, conn: sqlite3.Connection, path: Path, generation: int) -> None:
+        self.conn = conn
+        self.path = path
+        self.generation = generation
+
+
+def _thread_connection(
+    name: str, path: Path, pragmas: tuple[str, ...] = (), setup: tuple[str, ...] = ()
+) -> sqlite3.Connection:
+    """Get this thread's connection to path, opening it on first use."""
+    cached: _ThreadConnection | None = getattr(_local, name, None)
+    if cached is not None and cached.path == path and cached.generation == _generation:
+        return cached.conn
+
+    conn = _open_read_only(path, pragmas, setup)
+    with _lock:
+        _open_connections.append(conn)
+        entry = _ThreadConnection(conn, path, _generation)
+        # Close the connection once the thread exits (or replaces the entry)
+        weakref.finalize(entry, _release, conn)
+        setattr(_local, name, entry)
+    return conn
+
+
+def _release(conn: sqlite3.Connection) -> None:
+    """Close a connection whose thread no longer holds it."""
+    with _lock:
+        if conn in _open_connections:
+            _open_connections.remove(conn)
+    conn.close()
 
 
 def get_fs_db() -> sqlite3.Connection:
-    """Get connection to FamilySearch cache database."""
-    global _fs_conn
-    if _fs_conn is None:
-        _fs_conn = sqlite3.connect(str(FS_CACHE_PATH))
-        _fs_conn.row_factory = sqlite3.Row
-    return _fs_conn
+    """Get this thread's connection to FamilySearch cache database."""
+    return _thread_connection("fs", FS_CACHE_PATH, FS_PRAGMAS, FS_INDEXES)
 
 
 def get_sources_db() -> sqlite3.Connection:
-    """Get connection to research sources cache database."""
-    global _sources_conn
-    if _sources_conn is None:
-        _sources_conn = sqlite3.connect(str(SOURCES_CACHE_PATH))
-        _sources_conn.row_factory = sqlite3.Row
-    return _sources_conn
+    """Get this thread's connection to research sources cache database."""
+    return _thread_connection("sources", SOURCES_CACHE_PATH, SOURCES_PRAGMAS)
 
 
 def close_connections():
-    """Close all database connections."""
-    global _fs_conn, _sources_conn
-    if _fs_conn:
-        _fs_conn.close()
-        _fs_conn = None
-    if _sources_conn:
-        _sources_conn.close()
-        _sources_conn = None
+    """Close all database connections, in every thread, and drop cached query results."""
+    global _generation
+    with _lock:
+        connections = list(_open_connections)
+        _open_connections.clear()
+        _generation += 1
+    for conn in connections:
+        conn.close()
+    clear_query_caches()
+
+
+FsDbVersion = tuple[Path, int, int, int, int]
+
+# Version pinned for the current tool call by pinned_fs_db_version(), if any
+_pinned_version: ContextVar[FsDbVersion | None] = ContextVar("fs_db_version", default=None)
+
+
+def fs_db_version() -> FsDbVersion:
+    """
+    Identify the current contents of the FamilySearch cache database.
+
+    Returns the path with the mtime and size of the database and of its WAL file:
+    familysearch-mcp's writes land in the WAL first and only reach the main file
+    at checkpoints, so both are needed to notice a change. Our own opt-in setup
+    runs first, and an empty WAL (as left by opening a reader) counts as none, so
+    neither makes the first cached result stale. Inside pinned_fs_db_version() the
+    version checked on entry is returned without touching the files.
+    """
+    pinned = _pinned_version.get()
+    if pinned is not None and pinned[0] == FS_CACHE_PATH:
+        return pinned
+    return _check_fs_db_version()
+
+
+@contextlib.contextmanager
+def pinned_fs_db_version() -> Iterator[FsDbVersion]:
+    """
+    Check the FamilySearch cache database's version once for a whole tool call.
+
+    A cache hit in the per-person getters otherwise costs two stat() calls, about as
+    much as the SQLite lookup it saves. Changes made while the block runs are noticed
+    by the next call. Threads started from the block only see the pin if they run in
+    a copy of its context (contextvars.copy_context()).
+    """
+    pinned = _pinned_version.get()
+    if pinned is not None and pinned[0] == FS_CACHE_PATH:
+        yield pinned
+        return
+    version = _check_fs_db_version()
+    token = _pinned_version.set(version)
+    try:
+        yield version
+    finally:
+        _pinned_version.reset(token)
+
+
+def _check_fs_db_version() -> FsDbVersion:
+    """Stat the FamilySearch cache database and its WAL for fs_db_version()."""
+    path = FS_CACHE_PATH
+    _prepare(path, FS_INDEXES)
+    wal = _file_stamp(path.with_name(path.name + "-wal"))
+    return (path, *_file_stamp(path), *(wal if wal[1] else (0, 0)))
+
+
+def _file_stamp(path: Path) -> tuple[int, int]:
+    """(mtime_ns, size) of a file, or (0, 0) if it does not exist."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return (0, 0)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def cached_for_fs_db(func: Callable[P, R]) -> Callable[P, R]:
+    """
+    Cache a loader's results until the FamilySearch cache database changes.
+
+    Results are keyed on fs_db_version() and the call arguments, so every analysis
+    run against an unchanged database reuses one scan. Cached values are shared
+    between callers and must be treated as read-only.
+    """
+    return _version_cache(func, maxsize=None)
+
+
+def lru_cached_for_fs_db(maxsize: int) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """
+    Like cached_for_fs_db, but keep only the maxsize most recently used results.
+
+    Meant for per-person getters, which an audit calls again and again for the same
+    IDs (a parent is also checked as a person, a tool re-reads the person it just
+    validated) but which would otherwise grow without bound over a large tree.
+    """
+
+    def decorator(func: Callable[P, R]) -> Callable[P, R]:
+        return _version_cache(func, maxsize)
+
+    return decorator
+
+
+def clear_query_caches() -> None:
+    """Drop every cached query result, e.g. after the cache database is replaced."""
+    for clear in _cache_clearers:
+        clear()
+
+
+def _version_cache(func: Callable[P, R], maxsize: int | None) -> Callable[P, R]:
+    """Wrap func in a cache invalidated by fs_db_version(), optionally LRU-bounded."""
+    lock = threading.Lock()
+    version: list[Hashable] = [None]
+    results: OrderedDict[Hashable, R] = OrderedDict()
+
+    @functools.wraps(func)
+    def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+        current = fs_db_version()
+        key = (args, tuple(sorted(kwargs.items())))
+        with lock:
+            if version[0] != current:
+                results.clear()
+                version[0] = current
+            if key in results:
+                if maxsize is not None:
+                    results.move_to_end(key)
+                return results[key]
+        result = func(*args, **kwargs)
+        with lock:
+            if version[0] == current:
+                results[key] = result
+                if maxsize is not None and len(results) > maxsize:
+                    results.popitem(last=False)
+        return result
+
+    def clear() -> None:
+        with lock:
+            results.clear()
+
+    _cache_clearers.append(clear)
+    return wrapper
@@ -1,86 +1,143 @@
 """Prebuilt SQL queries for tree analysis."""
 
+import functools
+import sqlite3
+import sys
+from collections.abc import Iterable, Iterator, Sequence
 from typing import Any
 
-from db.connection import get_fs_db
+import jellyfish
 
+from db.connection import cached_for_fs_db, get_fs_db, lru_cached_for_fs_db
 
+# SQLite's default SQLITE_MAX_VARIABLE_NUMBER is 999; stay safely below it
+MAX_QUERY_PARAMS = 900
+
+# Per-person results kept by each single-person getter (results are shared, read-only)
+PERSON_CACHE_SIZE = 4096
+
+
+def _chunked(ids: list[str], size: int = MAX_QUERY_PARAMS) -> Iterator[list[str]]:
+    """
+    Split IDs into chunks small enough for a single IN (...) clause.
+
+    Short chunks are padded to the next power of two by repeating their last ID, so
+    each bulk getter only prepares a handful of statement shapes and they all stay in
+    the connection's statement cache. Repeated IDs in IN (...) match nothing extra.
+    """
+    for start in range(0, len(ids), size):
+        chunk = ids[start : start + size]
+        padded = min(size, 1 << (len(chunk) - 1).bit_length())
+        yield chunk + [chunk[-1]] * (padded - len(chunk))
+
+
+def _placeholders(count: int) -> str:
+    """Build the "?,?,..." parameter list for an IN (...) clause."""
+    return ",".join("?" * count)
+
+
+def _tuple_rows(sql: str, params: Sequence[Any] = ()) -> sqlite3.Cursor:
+    """Run a query on a cursor that returns plain tuples rather than sqlite3.Row objects."""
+    cursor = get_fs_db().cursor()
+    cursor.row_factory = None
+    return cursor.execute(sql, params)
+
+
+def _dict_rows(sql: str, params: Sequence[Any] = ()) -> Iterator[dict[str, Any]]:
+    """
+    Run a query and yield each row as a dict.
+
+    Rows come back as plain tuples and are zipped with column names read once per
+    query, which skips building a sqlite3.Row for every row only to copy it.
+    """
+    cursor = _tuple_rows(sql, params)
+    columns = [column[0] for column in cursor.description]
+    for row in cursor:
+        yield dict(zip(columns, row, strict=True))
+
+
+@lru_cached_for_fs_db(PERSON_CACHE_SIZE)
 def get_person_by_id(person_id: str) -> dict[str, Any] | None:
     """Get person by FamilySearch ID."""
-    conn = get_fs_db()
-    cursor = conn.execute("SELECT * FROM persons WHERE person_id = ?", (person_id,))
-    row = cursor.fetchone()
-    return dict(row) if row else None
+    return next(_dict_rows("SELECT * FROM persons WHERE person_id = ?", (person_id,)), None)
 
 
+@lru_cached_for_fs_db(PERSON_CACHE_SIZE)
 def get_person_names(person_id: str) -> list[dict[str, Any]]:
     """Get all name forms for a person."""
-    conn = get_fs_db()
-    cursor = conn.execute("SELECT * FROM person_names WHERE person_id = ?", (person_id,))
-    return [dict(row) for row in cursor.fetchall()]
+    rows = _dict_rows("SELECT * FROM person_names WHERE person_id = ?", (person_id,))
+    return list(rows)
 
 
+@lru_cached_for_fs_db(PERSON_CACHE_SIZE)
 def get_person_facts(person_id: str) -> list[dict[str, Any]]:
     """Get all facts/events for a person."""
-    conn = get_fs_db()
-    cursor = conn.execute(
-        "SELECT * FROM facts WHERE person_id = ? ORDER BY date_sort", (person_id,)
-    )
-    return [dict(row) for row in cursor.fetchall()]
+    rows = _dict_rows("SELECT * FROM facts WHERE person_id = ? ORDER BY date_sort", (person_id,))
+    return list(rows)
 
 
+@lru_cached_for_fs_db(PERSON_CACHE_SIZE)
 def get_parents(person_id: str) -> list[dict[str, Any]]:
     """Get parents of a person."""
-    conn = get_fs_db()
-    cursor = conn.execute(
+    rows = _dict_rows(
         """
         SELECT p.*, pcr.parent_role
         FROM persons p
         JOIN parent_child_relationships pcr ON p.person_id = pcr.parent_id
         WHERE pcr.child_id = ?
+        ORDER BY pcr.rowid
     """,
         (person_id,),
     )
-    return [dict(row) for row in cursor.fetchall()]
+    return list(rows)
 
 
+@lru_cached_for_fs_db(PERSON_CACHE_SIZE)
 def get_children(person_id: str) -> list[dict[str, Any]]:
     """Get children of a person."""
-    conn = get_fs_db()
-    cursor = conn.execute(
+    rows = _dict_rows(
         """
         SELECT p.*, pcr.parent_role
         FROM persons p
         JOIN parent_child_relationships pcr ON p.person_id = pcr.child_id
         WHERE pcr.parent_id = ?
+        ORDER BY pcr.rowid
     """,
         (person_id,),
     )
-    return [dict(row) for row in cursor.fetchall()]
+    return list(rows)
 
 
+@lru_cached_for_fs_db(PERSON_CACHE_SIZE)
 def get_spouses(person_id: str) -> list[dict[str, Any]]:
     """Get spouses of a person."""
-    conn = get_fs_db()
-    cursor = conn.execute(
+    # One branch per side of the couple, so each can seek its couple index; ordering
+    # by the couple row keeps the order a single join over the table would give
+    rows = _dict_rows(
         """
-        SELECT p.*, cr.marriage_date, cr.marriage_place
+        SELECT cr.rowid AS _order, p.*, cr.marriage_date, cr.marriage_place
         FROM persons p
-        JOIN couple_relationships cr ON (
-            (cr.person1_id = ? AND cr.person2_id = p.person_id) OR
-            (cr.person2_id = ? AND cr.person1_id = p.person_id)
-        )
-        WHERE p.person_id != ?
+        JOIN couple_relationships cr ON cr.person2_id = p.person_id
+        WHERE cr.person1_id = ? AND p.person_id != cr.person1_id
+        UNION ALL
+        SELECT cr.rowid AS _order, p.*, cr.marriage_date, cr.marriage_place
+        FROM persons p
+        JOIN couple_relationships cr ON cr.person1_id = p.person_id
+        WHERE cr.person2_id = ? AND p.person_id != cr.person2_id
+        ORDER BY _order
     """,
-        (person_id, person_id, person_id),
+        (person_id, person_id),
     )
-    return [dict(row) for row in cursor.fetchall()]
+    spouses = list(rows)
+    for spouse in spouses:
+        del spouse["_order"]
+    return spouses
 
 
+@lru_cached_for_fs_db(PERSON_CACHE_SIZE)
 def get_person_sources(person_id: str) -> list[dict[str, Any]]:
     """Get sources attached to a person."""
-    conn = get_fs_db()
-    cursor = conn.execute(
+    rows = _dict_rows(
         """
         SELECT s.*, psr.tag
         FROM sources s
@@ -89,26 +146,75 @@ def get_person_sources(person_id: str) -> list[dict[str, Any]]:
     """,
         (person_id,),
     )
-    return [dict(row) for row in cursor.fetchall()]
+    return list(rows)
 
 
-def get_all_persons_with_names() -> list[dict[str, Any]]:
-    """Get all persons with their primary names."""
-    conn = get_fs_db()
-    cursor = conn.execute("""
+@cached_for_fs_db
+def get_all_persons_with_names(surname_contains: str | None = None) -> list[dict[str, Any]]:
+    """
+    Get all persons with their primary names.
+
+    Soundex codes are interned, since blocking uses them as dict keys and a few
+    thousand codes repeat across the whole tree; names cached without a code get one
+    computed from the normalized name. surname_lower is precomputed for
+    case-insensitive surname filtering. Results are cached until the database changes.
+
+    Args:
+        surname_contains: Only return persons whose surname contains this text,
+            ignoring case
+    """
+    query = """
         SELECT p.person_id, p.display_name, p.gender,
                pn.given_name, pn.surname, pn.normalized_given, pn.normalized_surname,
                pn.soundex_given, pn.soundex_surname
         FROM persons p
         LEFT JOIN person_names pn ON p.person_id = pn.person_id AND pn.name_type = 'BirthName'
-    """)
-    return [dict(row) for row in cursor.fetchall()]
+    """
+    params: tuple[str, ...] = ()
+    needle = surname_contains.lower() if surname_contains else None
+    # LIKE only folds ASCII case, so it can prefilter ASCII needles; the exact
+    # check below still runs on every row it lets through
+    if needle and needle.isascii():
+        query += r" WHERE pn.surname LIKE ? ESCAPE '\'"
+        params = (f"%{_escape_like(needle)}%",)
+
+    persons = []
+    for person in _dict_rows(query, params):
+        person["surname_lower"] = person["surname"].lower() if person["surname"] else ""
+        if needle and needle not in person["surname_lower"]:
+            continue
+        for key, name_key in (
+            ("soundex_given", "normalized_given"),
+            ("soundex_surname", "normalized_surname"),
+        ):
+            if person[key]:
+                person[key] = sys.intern(person[key])
+            elif person[name_key]:
+                # Some cached names lack phonetic codes; derive them here, once per name
+                person[key] = _soundex(person[name_key])
+        persons.append(person)
+    return persons
+
+
+@functools.lru_cache(maxsize=8192)
+def _soundex(name: str) -> str:
+    """Interned Soundex code of a name."""
+    return sys.intern(jellyfish.soundex(name))
+
+
+def _escape_like(text: str) -> str:
+    """Escape LIKE wildcards so text matches literally (with ESCAPE '\\')."""
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def get_all_persons() -> list[dict[str, Any]]:
+    """Get every person in the cache, ordered by person ID."""
+    return list(_dict_rows("SELECT * FROM persons ORDER BY person_id"))
 
 
 def get_persons_by_surname(surname: str) -> list[dict[str, Any]]:
     """Get all persons with a given surname (fuzzy match)."""
-    conn = get_fs_db()
-    cursor = conn.execute(
+    rows = _dict_rows(
         """
         SELECT DISTINCT p.*
         FROM persons p
@@ -117,26 +223,24 @@ def get_persons_by_surname(surname: str) -> list[dict[str, Any]]:
     """,
         (f"%{surname}%",),
     )
-    return [dict(row) for row in cursor.fetchall()]
+    return list(rows)
 
 
 def get_persons_without_sources() -> list[dict[str, Any]]:
     """Get persons that have no source citations."""
-    conn = get_fs_db()
-    cursor = conn.execute("""
+    rows = _dict_rows("""
         SELECT p.*
         FROM persons p
         WHERE NOT EXISTS (
             SELECT 1 FROM person_source_refs psr WHERE psr.person_id = p.person_id
         )
     """)
-    return [dict(row) for row in cursor.fetchall()]
+    return list(rows)
 
 
 def get_facts_without_sources() -> list[dict[str, Any]]:
     """Get facts that have no supporting sources."""
-    conn = get_fs_db()
-    cursor = conn.execute("""
+    rows = _dict_rows("""
         SELECT f.*, p.display_name
         FROM facts f
         JOIN persons p ON f.person_id = p.person_id
@@ -146,4 +250,235 @@ def get_facts_without_sources() -> list[dict[str, Any]]:
         )
         AND f.fact_type IN ('Birth', 'Death', 'Marriage', 'Burial')
     """)
-    return [dict(row) for row in cursor.fetchall()]
+    return list(rows)
+
+
+def get_persons_bulk(person_ids: Iterable[str]) -> dict[str, dict[str, Any]]:
+    """Get many persons at once, keyed by person ID (IDs not found are left out)."""
+    ids = list(dict.fromkeys(person_ids))
+    result: dict[str, dict[str, Any]] = {}
+    for chunk in _chunked(ids):
+        rows = _dict_rows(
+            f"SELECT * FROM persons WHERE person_id IN ({_placeholders(len(chunk))})", chunk
+        )
+        for row in rows:
+            result[row["person_id"]] = row
+    return result
+
+
+def get_person_names_bulk(person_ids: Iterable[str]) -> dict[str, list[dict[str, Any]]]:
+    """Get all name forms for many persons at once, keyed by person ID."""
+    ids = list(dict.fromkeys(person_ids))
+    result: dict[str, list[dict[str, Any]]] = {person_id: [] for person_id in ids}
+    for chunk in _chunked(ids):
+        rows = _dict_rows(
+            f"SELECT * FROM person_names WHERE person_id IN ({_placeholders(len(chunk))})",
+            chunk,
+        )
+        for row in rows:
+            result[row["person_id"]].append(row)
+    return result
+
+
+def get_facts_bulk(person_ids: Iterable[str]) -> dict[str, list[dict[str, Any]]]:
+    """Get facts for many persons at once, keyed by person ID (ordered by date_sort)."""
+    ids = list(dict.fromkeys(person_ids))
+    result: dict[str, list[dict[str, Any]]] = {person_id: [] for person_id in ids}
+    for chunk in _chunked(ids):
+        rows = _dict_rows(
+            f"SELECT * FROM facts WHERE person_id IN ({_placeholders(len(chunk))}) ORDER BY date_sort",
+            chunk,
+        )
+        for row in rows:
+            result[row["person_id"]].append(row)
+    return result
+
+
+def get_sources_bulk(person_ids: Iterable[str]) -> dict[str, list[dict[str, Any]]]:
+    """Get sources for many persons at once, keyed by person ID."""
+    ids = list(dict.fromkeys(person_ids))
+    result: dict[str, list[dict[str, Any]]] = {person_id: [] for person_id in ids}
+    for chunk in _chunked(ids):
+        rows = _dict_rows(
+            f"""
+            SELECT psr.person_id AS _key, s.*, psr.tag
+            FROM sources s
+            JOIN person_source_refs psr ON s.source_id = psr.source_id
+            WHERE psr.person_id IN ({_placeholders(len(chunk))})
+        """,
+            chunk,
+        )
+        for source in rows:
+            result[source.pop("_key")].append(source)
+    return result
+
+
+def get_source_counts_bulk(person_ids: Iterable[str]) -> dict[str, int]:
+    """Count the sources attached to each of many persons, keyed by person ID."""
+    ids = list(dict.fromkeys(person_ids))
+    result = dict.fromkeys(ids, 0)
+    for chunk in _chunked(ids):
+        cursor = _tuple_rows(
+            f"""
+            SELECT psr.person_id, COUNT(*)
+            FROM person_source_refs psr
+            JOIN sources s ON s.source_id = psr.source_id
+            WHERE psr.person_id IN ({_placeholders(len(chunk))})
+            GROUP BY psr.person_id
+        """,
+            chunk,
+        )
+        for person_id, count in cursor:
+            result[person_id] = count
+    return result
+
+
+def get_parents_bulk(person_ids: Iterable[str]) -> dict[str, list[dict[str, Any]]]:
+    """Get parents for many persons at once, keyed by child person ID."""
+    ids = list(dict.fromkeys(person_ids))
+    result: dict[str, list[dict[str, Any]]] = {person_id: [] for person_id in ids}
+    for chunk in _chunked(ids):
+        rows = _dict_rows(
+            f"""
+            SELECT pcr.child_id AS _key, p.*, pcr.parent_role
+            FROM persons p
+            JOIN parent_child_relationships pcr ON p.person_id = pcr.parent_id
+            WHERE pcr.child_id IN ({_placeholders(len(chunk))})
+            ORDER BY pcr.rowid
+        """,
+            chunk,
+        )
+        for parent in rows:
+            result[parent.pop("_key")].append(parent)
+    return result
+
+
+def get_parent_names_bulk(person_ids: Iterable[str]) -> dict[str, list[str]]:
+    """Get only the parents' display names for many persons, keyed by child person ID."""
+    ids = list(dict.fromkeys(person_ids))
+    result: dict[str, list[str]] = {person_id: [] for person_id in ids}
+    for chunk in _chunked(ids):
+        cursor = _tuple_rows(
+            f"""
+            SELECT pcr.child_id, p.display_name
+            FROM persons p
+            JOIN parent_child_relationships pcr ON p.person_id = pcr.parent_id
+            WHERE pcr.child_id IN ({_placeholders(len(chunk))})
+            ORDER BY pcr.rowid
+        """,
+            chunk,
+        )
+        for child_id, display_name in cursor:
+            result[child_id].append(display_name)
+    return result
+
+
+def get_children_bulk(person_ids: Iterable[str]) -> dict[str, list[dict[str, Any]]]:
+    """Get children for many persons at once, keyed by parent person ID."""
+    ids = list(dict.fromkeys(person_ids))
+    result: dict[str, list[dict[str, Any]]] = {person_id: [] for person_id in ids}
+    for chunk in _chunked(ids):
+        rows = _dict_rows(
+            f"""
+            SELECT pcr.parent_id AS _key, p.*, pcr.parent_role
+            FROM persons p
+            JOIN parent_child_relationships pcr ON p.person_id = pcr.child_id
+            WHERE pcr.parent_id IN ({_placeholders(len(chunk))})
+            ORDER BY pcr.rowid
+        """,
+            chunk,
+        )
+        for child in rows:
+            result[child.pop("_key")].append(child)
+    return result
+
+
+def get_spouses_bulk(person_ids: Iterable[str]) -> dict[str, list[dict[str, Any]]]:
+    """Get spouses for many persons at once, keyed by person ID."""
+    ids = list(dict.fromkeys(person_ids))
+    result: dict[str, list[dict[str, Any]]] = {person_id: [] for person_id in ids}
+    # Each chunk is bound twice (once per side of the couple)
+    for chunk in _chunked(ids, MAX_QUERY_PARAMS // 2):
+        placeholders = _placeholders(len(chunk))
+        rows = _dict_rows(
+            f"""
+            SELECT cr.person1_id AS _key, cr.rowid AS _order, p.*,
+                cr.marriage_date, cr.marriage_place
+            FROM persons p
+            JOIN couple_relationships cr ON cr.person2_id = p.person_id
+            WHERE cr.person1_id IN ({placeholders}) AND p.person_id != cr.person1_id
+            UNION ALL
+            SELECT cr.person2_id AS _key, cr.rowid AS _order, p.*,
+                cr.marriage_date, cr.marriage_place
+            FROM persons p
+            JOIN couple_relationships cr ON cr.person1_id = p.person_id
+            WHERE cr.person2_id IN ({placeholders}) AND p.person_id != cr.person2_id
+            ORDER BY _order
+        """,
+            chunk + chunk,
+        )
+        for spouse in rows:
+            del spouse["_order"]
+            result[spouse.pop("_key")].append(spouse)
+    return result
+
+
+def get_spouse_names_bulk(person_ids: Iterable[str]) -> dict[str, list[str]]:
+    """Get only the spouses' display names for many persons, keyed by person ID."""
+    ids = list(dict.fromkeys(person_ids))
+    result: dict[str, list[str]] = {person_id: [] for person_id in ids}
+    # Each chunk is bound twice (once per side of the couple)
+    for chunk in _chunked(ids, MAX_QUERY_PARAMS // 2):
+        placeholders = _placeholders(len(chunk))
+        cursor = _tuple_rows(
+            f"""
+            SELECT cr.person1_id, p.display_name, cr.rowid AS _order
+            FROM persons p
+            JOIN couple_relationships cr ON cr.person2_id = p.person_id
+            WHERE cr.person1_id IN ({placeholders}) AND p.person_id != cr.person1_id
+            UNION ALL
+            SELECT cr.person2_id, p.display_name, cr.rowid AS _order
+            FROM persons p
+            JOIN couple_relationships cr ON cr.person1_id = p.person_id
+            WHERE cr.person2_id IN ({placeholders}) AND p.person_id != cr.person2_id
+            ORDER BY _order
+        """,
+            chunk + chunk,
+        )
+        for person_id, display_name, _ in cursor:
+            result[person_id].append(display_name)
+    return result
+
+
+@cached_for_fs_db
+def get_vital_facts() -> dict[str, dict[str, dict[str, Any]]]:
+    """
+    Get Birth and Death facts for every person in one scan.
+
+    Returns:
+        Dict of person ID -> {fact_type: fact}; when a person has several facts of one
+        type the latest by date_sort wins, as when indexing get_person_facts by type
+    """
+    rows = _dict_rows(
+        "SELECT * FROM facts WHERE fact_type IN ('Birth', 'Death') ORDER BY date_sort"
+    )
+    result: dict[str, dict[str, dict[str, Any]]] = {}
+    for row in rows:
+        result.setdefault(row["person_id"], {})[row["fact_type"]] = row
+    return result
+
+
+@cached_for_fs_db
+def get_all_parent_edges() -> list[tuple[str, str]]:
+    """
+    Get every (child_id, parent_id) edge in the tree in a single scan.
+
+    Like get_parents, edges to a parent missing from persons are left out.
+    """
+    cursor = _tuple_rows("""
+        SELECT pcr.child_id, pcr.parent_id
+        FROM parent_child_relationships pcr
+        JOIN persons p ON p.person_id = pcr.parent_id
+        ORDER BY pcr.rowid
+    """)
+    return cursor.fetchall()
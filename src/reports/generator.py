@@ -1,15 +1,23 @@
 """Report generator using Jinja2 templates."""
 
+import threading
+from collections import Counter
+from collections.abc import Callable, Hashable
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import copy_context
 from datetime import datetime
+from itertools import chain
 from pathlib import Path
+from typing import Any
 
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from jinja2 import Environment, FileSystemLoader, Template, select_autoescape
 
 from analysis.duplicate_detector import find_likely_duplicates
 from analysis.name_disambiguation import detect_name_clusters
 from analysis.relationship_checker import validate_relationships_for_tree
 from analysis.source_coverage import prioritize_source_research
 from analysis.timeline_validator import validate_all_timelines
+from db.connection import fs_db_version
 from db.queries import (
     get_parents,
     get_person_by_id,
@@ -32,14 +40,70 @@ env = Environment(
     autoescape=select_autoescape(["html", "xml"]),
     trim_blocks=True,
     lstrip_blocks=True,
+    # Templates ship with the package; skip the per-render mtime check
+    auto_reload=False,
 )
 
 # Add custom filters
 env.filters["person_url"] = person_url
 
+# Compile every report template once, at import
+PROFILE_TEMPLATE = env.get_template("person_profile.md.j2")
+AUDIT_TEMPLATE = env.get_template("full_audit.md.j2")
+NAME_CLUSTERS_TEMPLATE = env.get_template("name_clusters.md.j2")
+RESEARCH_LEADS_TEMPLATE = env.get_template("research_leads.md.j2")
+
+# Long-lived threads for the audit's analysis passes: each keeps its read-only
+# connection (and the connection's page cache) from one report to the next. The pool
+# is created by the first audit, so importing this module (as every report worker
+# process does) does not create it.
+ANALYSIS_WORKERS = 4
+_analysis_pool: ThreadPoolExecutor | None = None
+_analysis_pool_lock = threading.Lock()
+
+# Profile file -> (fs_db_version() it was last rendered from, its mtime_ns after writing)
+_profile_versions: dict[Path, tuple[Hashable, int]] = {}
+
+# Write reports through a 1 MiB buffer: one disk write per MiB, not per 8 KiB
+WRITE_BUFFER_SIZE = 1 << 20
+
+
+def _write_report(template: Template, context: dict[str, Any], output_file: Path) -> None:
+    """Render template into output_file piece by piece, as the template produces it."""
+    with open(output_file, "wb", buffering=WRITE_BUFFER_SIZE) as f:
+        template.stream(context).dump(f, encoding="utf-8")
+
+
+def _submit_analysis(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Future[Any]:
+    """Run func on the analysis pool in a copy of the caller's context (and pinned version)."""
+    global _analysis_pool
+    with _analysis_pool_lock:
+        if _analysis_pool is None:
+            _analysis_pool = ThreadPoolExecutor(
+                max_workers=ANALYSIS_WORKERS, thread_name_prefix="audit"
+            )
+        pool = _analysis_pool
+    return pool.submit(copy_context().run, func, *args, **kwargs)
+
 
 def generate_person_profile(person_id: str) -> str:
-    """Generate detailed profile report for a single person."""
+    """
+    Generate detailed profile report for a single person.
+
+    A profile already rendered from the unchanged database is returned as is, as
+    long as its file is still there and has not been replaced by an older one. Such a
+    profile keeps the generated_at timestamp of when it was first rendered.
+    """
+    output_file = OUTPUT_DIR / f"person_{person_id}.md"
+    version = fs_db_version()
+    rendered = _profile_versions.get(output_file)
+    if rendered is not None and rendered[0] == version:
+        try:
+            if output_file.stat().st_mtime_ns >= rendered[1]:
+                return str(output_file)
+        except OSError:
+            pass
+
     person = get_person_by_id(person_id)
     if not person:
         return f"Person {person_id} not found"
@@ -58,11 +122,8 @@ def generate_person_profile(person_id: str) -> str:
         "generated_at": datetime.now().isoformat(),
     }
 
-    template = env.get_template("person_profile.md.j2")
-    content = template.render(context)
-
-    output_file = OUTPUT_DIR / f"person_{person_id}.md"
-    output_file.write_text(content)
+    _write_report(PROFILE_TEMPLATE, context, output_file)
+    _profile_versions[output_file] = (version, output_file.stat().st_mtime_ns)
 
     return str(output_file)
 
@@ -73,39 +134,45 @@ def generate_audit_report(root_person_id: str, generations: int = 4) -> str:
     if not root_person:
         return f"Root person {root_person_id} not found"
 
-    # Collect all analysis results
-    timeline_issues = validate_all_timelines(min_severity="warning")
-    relationship_issues = validate_relationships_for_tree(root_person_id, max_persons=500)
-    source_priorities = prioritize_source_research(root_person_id, generations)
-    duplicates = find_likely_duplicates(threshold=0.85)
-
-    # Count by severity
-    critical_count = len(
-        [i for i in timeline_issues + relationship_issues if i.get("severity") == "critical"]
+    # Collect all analysis results. The passes are independent and spend much of their
+    # time in SQLite, NumPy and rapidfuzz, which release the GIL, so they run side by
+    # side on the shared analysis pool.
+    timeline_future = _submit_analysis(validate_all_timelines, min_severity="warning")
+    relationship_future = _submit_analysis(
+        validate_relationships_for_tree, root_person_id, max_persons=500
     )
-    warning_count = len(
-        [i for i in timeline_issues + relationship_issues if i.get("severity") == "warning"]
+    priorities_future = _submit_analysis(
+        prioritize_source_research, root_person_id, generations, limit=50
     )
+    duplicates_future = _submit_analysis(find_likely_duplicates, threshold=0.85, limit=20)
+    timeline_issues = timeline_future.result()
+    relationship_issues = relationship_future.result()
+    source_priorities = priorities_future.result()
+    duplicates = duplicates_future.result()
+
+    # Count by severity, in one pass over both issue lists
+    severity_counts = Counter(
+        issue.get("severity") for issue in chain(timeline_issues, relationship_issues)
+    )
+    critical_count = severity_counts["critical"]
+    warning_count = severity_counts["warning"]
 
     context = {
         "root_person": root_person,
         "generations": generations,
         "timeline_issues": timeline_issues,
         "relationship_issues": relationship_issues,
-        "source_priorities": source_priorities[:50],  # Top 50
-        "duplicates": duplicates[:20],  # Top 20
+        "source_priorities": source_priorities,  # Top 50
+        "duplicates": duplicates,  # Top 20
         "critical_count": critical_count,
         "warning_count": warning_count,
         "generated_at": datetime.now().isoformat(),
     }
 
-    template = env.get_template("full_audit.md.j2")
-    content = template.render(context)
-
     output_file = (
         OUTPUT_DIR / f"audit_{root_person_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
     )
-    output_file.write_text(content)
+    _write_report(AUDIT_TEMPLATE, context, output_file)
 
     return str(output_file)
 
@@ -124,36 +191,30 @@ def generate_name_clusters_report(
         "generated_at": datetime.now().isoformat(),
     }
 
-    template = env.get_template("name_clusters.md.j2")
-    content = template.render(context)
-
     surname_suffix = f"_{surname_filter}" if surname_filter else "_all"
     output_file = (
         OUTPUT_DIR / f"name_clusters{surname_suffix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
     )
-    output_file.write_text(content)
+    _write_report(NAME_CLUSTERS_TEMPLATE, context, output_file)
 
     return str(output_file)
 
 
 def generate_research_leads(root_person_id: str, focus_area: str = "all") -> str:
     """Generate prioritized research leads report."""
-    source_priorities = prioritize_source_research(root_person_id, generations=5)
+    source_priorities = prioritize_source_research(root_person_id, generations=5, limit=30)
 
     context = {
         "root_person_id": root_person_id,
         "focus_area": focus_area,
-        "priorities": source_priorities[:30],  # Top 30
+        "priorities": source_priorities,  # Top 30
         "generated_at": datetime.now().isoformat(),
     }
 
-    template = env.get_template("research_leads.md.j2")
-    content = template.render(context)
-
     output_file = (
         OUTPUT_DIR
         / f"research_leads_{root_person_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
     )
-    output_file.write_text(content)
+    _write_report(RESEARCH_LEADS_TEMPLATE, context, output_file)
 
     return str(output_file)
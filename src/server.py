@@ -1,12 +1,15 @@
 #!/usr/bin/env python3
 """Tree Analyzer MCP Server - Analysis and reporting for family tree data."""
 
-import json
+import asyncio
+from typing import Any
 
+import orjson
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import TextContent, Tool
 
+from db.connection import pinned_fs_db_version
 from tools.analysis_tools import (
     tool_analyze_source_coverage,
     tool_check_relationships,
@@ -19,6 +22,7 @@ from tools.report_tools import (
     tool_generate_audit_report,
     tool_generate_name_clusters_report,
     tool_generate_person_profile,
+    tool_generate_report_bundle,
     tool_generate_research_leads,
 )
 
@@ -179,6 +183,48 @@ async def list_tools() -> list[Tool]:
                 },
             },
         ),
+        Tool(
+            name="generate_report_bundle",
+            description=(
+                "Generate the audit, research leads, name clusters and person profile "
+                "reports together, in parallel"
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "root_person_id": {"type": "string", "description": "Root person for the tree"},
+                    "person_id": {
+                        "type": "string",
+                        "description": "Person to profile (defaults to the root person)",
+                    },
+                    "surname_filter": {
+                        "type": "string",
+                        "description": "Optional surname to focus the name clusters on",
+                    },
+                    "similarity_threshold": {
+                        "type": "number",
+                        "description": "Minimum similarity score for name clusters",
+                        "default": 0.60,
+                        "minimum": 0.0,
+                        "maximum": 1.0,
+                    },
+                    "focus_area": {
+                        "type": "string",
+                        "description": "Research leads focus area",
+                        "enum": ["all", "sources", "records"],
+                        "default": "all",
+                    },
+                    "generations": {
+                        "type": "integer",
+                        "description": "Number of generations to audit",
+                        "default": 4,
+                        "minimum": 1,
+                        "maximum": 10,
+                    },
+                },
+                "required": ["root_person_id"],
+            },
+        ),
         Tool(
             name="generate_research_leads",
             description="Generate prioritized research leads report",
@@ -203,57 +249,84 @@ async def list_tools() -> list[Tool]:
 async def call_tool(name: str, arguments: dict) -> list[TextContent]:
     """Handle tool calls."""
     try:
-        result = None
+        # Tools are blocking (SQLite scans, scoring, file writes); run them on a worker
+        # thread, each with its own read-only connection, so the event loop keeps
+        # serving other requests meanwhile. Large results are encoded there too.
+        text = await asyncio.to_thread(_run_tool_to_json, name, arguments)
+        return [TextContent(type="text", text=text)]
 
-        if name == "detect_name_duplicates":
-            result = tool_detect_name_duplicates(
-                surname_filter=arguments.get("surname_filter"),
-                similarity_threshold=arguments.get("similarity_threshold", 0.60),
-            )
-        elif name == "validate_timeline":
-            result = tool_validate_timeline(
-                person_id=arguments.get("person_id"),
-                min_severity=arguments.get("min_severity", "warning"),
-            )
-        elif name == "check_relationships":
-            result = tool_check_relationships(
-                person_id=arguments["person_id"], check_types=arguments.get("check_types")
-            )
-        elif name == "analyze_source_coverage":
-            result = tool_analyze_source_coverage(
-                root_person_id=arguments["root_person_id"],
-                min_sources_per_person=arguments.get("min_sources_per_person", 1),
-            )
-        elif name == "find_duplicates":
-            result = tool_find_duplicates(threshold=arguments.get("threshold", 0.85))
-        elif name == "compare_persons":
-            result = tool_compare_persons(
-                person_id_a=arguments["person_id_a"], person_id_b=arguments["person_id_b"]
-            )
-        elif name == "generate_person_profile":
-            result = tool_generate_person_profile(person_id=arguments["person_id"])
-        elif name == "generate_audit_report":
-            result = tool_generate_audit_report(
-                root_person_id=arguments["root_person_id"],
-                generations=arguments.get("generations", 4),
-            )
-        elif name == "generate_name_clusters_report":
-            result = tool_generate_name_clusters_report(
-                surname_filter=arguments.get("surname_filter"),
-                similarity_threshold=arguments.get("similarity_threshold", 0.60),
-            )
-        elif name == "generate_research_leads":
-            result = tool_generate_research_leads(
-                root_person_id=arguments["root_person_id"],
-                focus_area=arguments.get("focus_area", "all"),
-            )
-        else:
-            raise ValueError(f"Unknown tool: {name}")
+    except Exception as e:
+        return [TextContent(type="text", text=_to_json({"error": str(e)}))]
 
-        return [TextContent(type="text", text=json.dumps(result, indent=2))]
 
-    except Exception as e:
-        return [TextContent(type="text", text=json.dumps({"error": str(e)}))]
+def _to_json(value: Any, indent: bool = False) -> str:
+    """Serialize a tool result; orjson is several times faster than json on large results."""
+    option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+    return orjson.dumps(value, option=option).decode()
+
+
+def _run_tool_to_json(name: str, arguments: dict) -> str:
+    """Run a tool against one check of the cache database's version, and encode its result."""
+    with pinned_fs_db_version():
+        result = _run_tool(name, arguments)
+    return _to_json(result, indent=True)
+
+
+def _run_tool(name: str, arguments: dict) -> Any:
+    """Dispatch a tool call to its implementation."""
+    if name == "detect_name_duplicates":
+        return tool_detect_name_duplicates(
+            surname_filter=arguments.get("surname_filter"),
+            similarity_threshold=arguments.get("similarity_threshold", 0.60),
+        )
+    elif name == "validate_timeline":
+        return tool_validate_timeline(
+            person_id=arguments.get("person_id"),
+            min_severity=arguments.get("min_severity", "warning"),
+        )
+    elif name == "check_relationships":
+        return tool_check_relationships(
+            person_id=arguments["person_id"], check_types=arguments.get("check_types")
+        )
+    elif name == "analyze_source_coverage":
+        return tool_analyze_source_coverage(
+            root_person_id=arguments["root_person_id"],
+            min_sources_per_person=arguments.get("min_sources_per_person", 1),
+        )
+    elif name == "find_duplicates":
+        return tool_find_duplicates(threshold=arguments.get("threshold", 0.85))
+    elif name == "compare_persons":
+        return tool_compare_persons(
+            person_id_a=arguments["person_id_a"], person_id_b=arguments["person_id_b"]
+        )
+    elif name == "generate_person_profile":
+        return tool_generate_person_profile(person_id=arguments["person_id"])
+    elif name == "generate_audit_report":
+        return tool_generate_audit_report(
+            root_person_id=arguments["root_person_id"],
+            generations=arguments.get("generations", 4),
+        )
+    elif name == "generate_name_clusters_report":
+        return tool_generate_name_clusters_report(
+            surname_filter=arguments.get("surname_filter"),
+            similarity_threshold=arguments.get("similarity_threshold", 0.60),
+        )
+    elif name == "generate_report_bundle":
+        return tool_generate_report_bundle(
+            root_person_id=arguments["root_person_id"],
+            person_id=arguments.get("person_id"),
+            surname_filter=arguments.get("surname_filter"),
+            similarity_threshold=arguments.get("similarity_threshold", 0.60),
+            focus_area=arguments.get("focus_area", "all"),
+            generations=arguments.get("generations", 4),
+        )
+    elif name == "generate_research_leads":
+        return tool_generate_research_leads(
+            root_person_id=arguments["root_person_id"],
+            focus_area=arguments.get("focus_area", "all"),
+        )
+    else:
+        raise ValueError(f"Unknown tool: {name}")
 
 
 async def main():
@@ -138,32 +138,37 @@ def tool_compare_persons(person_id_a: str, person_id_b: str) -> dict[str, Any]:
         person_id_a: First person ID
         person_id_b: Second person ID
     """
-    from analysis.name_disambiguation import compute_similarity_score
+    from analysis.name_disambiguation import build_similarity_context, compute_similarity_score
     from db.queries import (
-        get_parents,
-        get_person_facts,
-        get_person_names,
-        get_person_sources,
-        get_spouses,
+        get_facts_bulk,
+        get_parent_names_bulk,
+        get_person_names_bulk,
+        get_persons_bulk,
+        get_source_counts_bulk,
+        get_spouse_names_bulk,
     )
 
-    person_a = get_person_by_id(person_id_a)
-    person_b = get_person_by_id(person_id_b)
+    # Fetch both persons' data together: one query per table
+    ids = [person_id_a, person_id_b]
+    persons = get_persons_bulk(ids)
+    person_a = persons.get(person_id_a)
+    person_b = persons.get(person_id_b)
 
     if not person_a or not person_b:
         return {"error": "One or both persons not found"}
 
     # Get all data for comparison
-    names_a = get_person_names(person_id_a)
-    names_b = get_person_names(person_id_b)
-    facts_a = get_person_facts(person_id_a)
-    facts_b = get_person_facts(person_id_b)
-    parents_a = get_parents(person_id_a)
-    parents_b = get_parents(person_id_b)
-    spouses_a = get_spouses(person_id_a)
-    spouses_b = get_spouses(person_id_b)
-    sources_a = get_person_sources(person_id_a)
-    sources_b = get_person_sources(person_id_b)
+    names = get_person_names_bulk(ids)
+    facts = get_facts_bulk(ids)
+    # Relatives are only reported and compared by name
+    parents = get_parent_names_bulk(ids)
+    spouses = get_spouse_names_bulk(ids)
+    # Only the number of sources is reported, so let SQLite count them
+    source_counts = get_source_counts_bulk(ids)
+    names_a, names_b = names[person_id_a], names[person_id_b]
+    facts_a, facts_b = facts[person_id_a], facts[person_id_b]
+    parents_a, parents_b = parents[person_id_a], parents[person_id_b]
+    spouses_a, spouses_b = spouses[person_id_a], spouses[person_id_b]
 
     # Compute similarity score
     # Need to create a dict format compatible with compute_similarity_score
@@ -180,7 +185,8 @@ def tool_compare_persons(person_id_a: str, person_id_b: str) -> dict[str, Any]:
         "normalized_surname": names_b[0]["normalized_surname"] if names_b else "",
     }
 
-    similarity = compute_similarity_score(p_a_dict, p_b_dict)
+    ctx = build_similarity_context(ids, facts=facts, parent_names=parents, spouse_names=spouses)
+    similarity = compute_similarity_score(p_a_dict, p_b_dict, ctx)
 
     return {
         "person_a": {
@@ -188,18 +194,18 @@ def tool_compare_persons(person_id_a: str, person_id_b: str) -> dict[str, Any]:
             "name": person_a["display_name"],
             "names": names_a,
             "facts": facts_a,
-            "parents": [p["display_name"] for p in parents_a],
-            "spouses": [s["display_name"] for s in spouses_a],
-            "source_count": len(sources_a),
+            "parents": parents_a,
+            "spouses": spouses_a,
+            "source_count": source_counts[person_id_a],
         },
         "person_b": {
             "id": person_id_b,
             "name": person_b["display_name"],
             "names": names_b,
             "facts": facts_b,
-            "parents": [p["display_name"] for p in parents_b],
-            "spouses": [s["display_name"] for s in spouses_b],
-            "source_count": len(sources_b),
+            "parents": parents_b,
+            "spouses": spouses_b,
+            "source_count": source_counts[person_id_b],
         },
         "similarity_score": round(similarity, 3),
         "likely_duplicate": similarity >= 0.85,
@@ -1,7 +1,15 @@
 """MCP tools for report generation."""
 
+import multiprocessing
+import os
+import sys
+from collections.abc import Callable
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from pathlib import Path
 from typing import Any
 
+from db import connection
+from reports import generator
 from reports.generator import (
     generate_audit_report,
     generate_name_clusters_report,
@@ -76,3 +84,89 @@ def tool_generate_research_leads(root_person_id: str, focus_area: str = "all") -
         "output_file": output_file,
         "message": f"Research leads report generated at {output_file}",
     }
+
+
+def tool_generate_report_bundle(
+    root_person_id: str,
+    person_id: str | None = None,
+    surname_filter: str | None = None,
+    similarity_threshold: float = 0.60,
+    focus_area: str = "all",
+    generations: int = 4,
+) -> dict[str, Any]:
+    """
+    Generate the audit, research leads, name clusters and person profile reports together.
+
+    The reports are independent, so on multi-core hosts each one is generated in its
+    own worker process and the bundle takes as long as the slowest report.
+
+    Args:
+        root_person_id: Root person for the audit and research leads
+        person_id: Person to profile (defaults to the root person)
+        surname_filter: Optional surname to focus the name clusters on
+        similarity_threshold: Minimum similarity score for name clusters
+        focus_area: Research leads focus area ('all', 'sources', 'records')
+        generations: Number of generations to audit
+    """
+    jobs: dict[str, tuple[Callable[..., str], tuple[Any, ...]]] = {
+        "audit_report": (generate_audit_report, (root_person_id, generations)),
+        "research_leads": (generate_research_leads, (root_person_id, focus_area)),
+        "name_clusters": (generate_name_clusters_report, (surname_filter, similarity_threshold)),
+        "person_profile": (generate_person_profile, (person_id or root_person_id,)),
+    }
+
+    workers = min(len(jobs), os.cpu_count() or 1)
+    if workers < 2:
+        output_files = {name: func(*args) for name, (func, args) in jobs.items()}
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_report_worker,
+            initargs=(
+                connection.FS_CACHE_PATH,
+                connection.SOURCES_CACHE_PATH,
+                connection.PREPARE_CACHE_DATABASES,
+                generator.OUTPUT_DIR,
+            ),
+        ) as pool:
+            output_files = _collect(pool, jobs)
+
+    return {
+        "root_person_id": root_person_id,
+        "output_files": output_files,
+        "message": f"Generated {len(output_files)} reports",
+    }
+
+
+def _collect(
+    pool: Executor, jobs: dict[str, tuple[Callable[..., str], tuple[Any, ...]]]
+) -> dict[str, str]:
+    """Submit every job to pool, then wait for each output file."""
+    futures: dict[str, Future[str]] = {
+        name: pool.submit(_run_report, func, *args) for name, (func, args) in jobs.items()
+    }
+    return {name: future.result() for name, future in futures.items()}
+
+
+def _run_report(func: Callable[..., str], *args: Any) -> str:
+    """Worker process entry point: generate one report against one database version check."""
+    with connection.pinned_fs_db_version():
+        return func(*args)
+
+
+def _init_report_worker(
+    fs_cache_path: Path, sources_cache_path: Path, prepare_cache: bool, output_dir: Path
+) -> None:
+    """
+    Process pool initializer: read and write where the parent process does.
+
+    Workers inherit the server's stdout, which carries the MCP protocol stream, so
+    anything they print is sent to stderr instead.
+    """
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    sys.stdout = sys.stderr
+    connection.FS_CACHE_PATH = fs_cache_path
+    connection.SOURCES_CACHE_PATH = sources_cache_path
+    connection.PREPARE_CACHE_DATABASES = prepare_cache
+    generator.OUTPUT_DIR = output_dir
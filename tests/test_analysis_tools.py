@@ -20,7 +20,9 @@ def simple_db(tmp_path: Path) -> Path:
     db_path = tmp_path / "simple.sqlite"
     conn = sqlite3.connect(str(db_path))
 
+    # Schema and data in one transaction
     conn.executescript("""
+        BEGIN;
         CREATE TABLE persons (person_id TEXT PRIMARY KEY, display_name TEXT, gender TEXT);
         CREATE TABLE person_names (person_id TEXT, name_type TEXT, given_name TEXT, surname TEXT,
             normalized_given TEXT, normalized_surname TEXT, soundex_given TEXT, soundex_surname TEXT);
@@ -30,17 +32,17 @@ def simple_db(tmp_path: Path) -> Path:
         CREATE TABLE sources (source_id TEXT PRIMARY KEY, title TEXT);
         CREATE TABLE person_source_refs (person_id TEXT, source_id TEXT, tag TEXT);
 
-        INSERT INTO persons VALUES ('P1', 'Alice Smith', 'F');
-        INSERT INTO persons VALUES ('P2', 'Alice Smith', 'F');
+        INSERT INTO persons VALUES ('P1', 'Alice Smith', 'F'), ('P2', 'Alice Smith', 'F');
         INSERT INTO person_names VALUES
             ('P1', 'BirthName', 'Alice', 'Smith', 'alice', 'smith', 'A420', 'S530'),
             ('P2', 'BirthName', 'Alice', 'Smith', 'alice', 'smith', 'A420', 'S530');
-        INSERT INTO facts VALUES ('P1', 'Birth', 19600101, 'California');
-        INSERT INTO facts VALUES ('P1', 'Death', 20200101, 'California');
-        INSERT INTO facts VALUES ('P2', 'Birth', 19600101, 'California');
+        INSERT INTO facts VALUES
+            ('P1', 'Birth', 19600101, 'California'),
+            ('P1', 'Death', 20200101, 'California'),
+            ('P2', 'Birth', 19600101, 'California');
+        COMMIT;
     """)
 
-    conn.commit()
     conn.close()
     return db_path
 
@@ -49,7 +51,6 @@ def simple_db(tmp_path: Path) -> Path:
 def mock_simple_db(simple_db: Path) -> None:
     """Automatically patch the database for all tests."""
     with patch.object(connection, "FS_CACHE_PATH", simple_db):
-        connection._fs_conn = None
         yield
         connection.close_connections()
 
@@ -1,6 +1,8 @@
 """Tests for database connection module."""
 
 import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
@@ -46,8 +48,6 @@ def mock_sources_db(tmp_path: Path) -> Path:
 def test_get_fs_db(mock_fs_db: Path) -> None:
     """Test getting FamilySearch database connection."""
     with patch.object(connection, "FS_CACHE_PATH", mock_fs_db):
-        # Reset the global connection
-        connection._fs_conn = None
 
         conn = connection.get_fs_db()
         assert conn is not None
@@ -60,11 +60,31 @@ def test_get_fs_db(mock_fs_db: Path) -> None:
         assert row["display_name"] == "Test Person"
 
 
+def test_get_fs_db_applies_pragmas(mock_fs_db: Path) -> None:
+    """Test that the FamilySearch connection is tuned for read-heavy analysis."""
+    with patch.object(connection, "FS_CACHE_PATH", mock_fs_db):
+        conn = connection.get_fs_db()
+        assert conn.execute("PRAGMA cache_size").fetchone()[0] == -262144
+        assert conn.execute("PRAGMA query_only").fetchone()[0] == 1
+        assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+
+        connection.close_connections()
+
+
+def test_get_fs_db_connection_usable_from_other_threads(mock_fs_db: Path) -> None:
+    """Test that a connection handed to a worker thread can still be queried there."""
+    with patch.object(connection, "FS_CACHE_PATH", mock_fs_db):
+        conn = connection.get_fs_db()
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            count = pool.submit(lambda: conn.execute("SELECT COUNT(*) FROM persons").fetchone()[0])
+            assert count.result() == 1
+
+        connection.close_connections()
+
+
 def test_get_sources_db(mock_sources_db: Path) -> None:
     """Test getting sources database connection."""
     with patch.object(connection, "SOURCES_CACHE_PATH", mock_sources_db):
-        # Reset the global connection
-        connection._sources_conn = None
 
         conn = connection.get_sources_db()
         assert conn is not None
@@ -74,13 +94,12 @@ def test_get_sources_db(mock_sources_db: Path) -> None:
         cursor = conn.execute("SELECT * FROM external_matches")
         row = cursor.fetchone()
         assert row["source_name"] == "wikitree"
+        assert conn.execute("PRAGMA query_only").fetchone()[0] == 1
 
 
 def test_get_fs_db_reuses_connection(mock_fs_db: Path) -> None:
     """Test that get_fs_db reuses existing connection."""
     with patch.object(connection, "FS_CACHE_PATH", mock_fs_db):
-        connection._fs_conn = None
-
         conn1 = connection.get_fs_db()
         conn2 = connection.get_fs_db()
 
@@ -90,8 +109,6 @@ def test_get_fs_db_reuses_connection(mock_fs_db: Path) -> None:
 def test_get_sources_db_reuses_connection(mock_sources_db: Path) -> None:
     """Test that get_sources_db reuses existing connection."""
     with patch.object(connection, "SOURCES_CACHE_PATH", mock_sources_db):
-        connection._sources_conn = None
-
         conn1 = connection.get_sources_db()
         conn2 = connection.get_sources_db()
 
@@ -104,16 +121,176 @@ def test_close_connections(mock_fs_db: Path, mock_sources_db: Path) -> None:
         patch.object(connection, "FS_CACHE_PATH", mock_fs_db),
         patch.object(connection, "SOURCES_CACHE_PATH", mock_sources_db),
     ):
-        connection._fs_conn = None
-        connection._sources_conn = None
-
         # Open connections
-        connection.get_fs_db()
-        connection.get_sources_db()
+        fs_conn = connection.get_fs_db()
+        sources_conn = connection.get_sources_db()
 
         # Close them
         connection.close_connections()
 
-        # Verify they're closed by checking the global variables
-        assert connection._fs_conn is None
-        assert connection._sources_conn is None
+        # Verify they're closed and the next call reopens
+        with pytest.raises(sqlite3.ProgrammingError):
+            fs_conn.execute("SELECT 1")
+        with pytest.raises(sqlite3.ProgrammingError):
+            sources_conn.execute("SELECT 1")
+        assert connection.get_fs_db() is not fs_conn
+
+        connection.close_connections()
+
+
+def test_get_fs_db_per_thread(mock_fs_db: Path) -> None:
+    """Test that each thread gets its own connection."""
+    with patch.object(connection, "FS_CACHE_PATH", mock_fs_db):
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            worker_conn = pool.submit(connection.get_fs_db).result()
+
+            assert worker_conn is not connection.get_fs_db()
+            assert worker_conn.execute("SELECT COUNT(*) FROM persons").fetchone()[0] == 1
+
+        connection.close_connections()
+
+
+def test_get_fs_db_is_read_only(mock_fs_db: Path) -> None:
+    """Test that the FamilySearch cache cannot be modified through our connection."""
+    with patch.object(connection, "FS_CACHE_PATH", mock_fs_db):
+        conn = connection.get_fs_db()
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("DELETE FROM persons")
+
+        connection.close_connections()
+
+
+def test_cached_for_fs_db_invalidates_on_change(mock_fs_db: Path) -> None:
+    """Test that cached loaders rerun only after the database file changes."""
+    calls = []
+
+    @connection.cached_for_fs_db
+    def load() -> int:
+        calls.append(1)
+        return len(calls)
+
+    with patch.object(connection, "FS_CACHE_PATH", mock_fs_db):
+        assert load() == 1
+        assert load() == 1
+
+        conn = sqlite3.connect(str(mock_fs_db))
+        conn.execute("INSERT INTO persons VALUES ('TEST-456', 'Another Person')")
+        conn.commit()
+        conn.close()
+
+        assert load() == 2
+
+
+def test_lru_cached_for_fs_db_evicts_least_recent(mock_fs_db: Path) -> None:
+    """Test that bounded caches drop the least recently used result."""
+    calls: list[str] = []
+
+    @connection.lru_cached_for_fs_db(2)
+    def load(key: str) -> str:
+        calls.append(key)
+        return key
+
+    with patch.object(connection, "FS_CACHE_PATH", mock_fs_db):
+        load("a")
+        load("b")
+        load("a")  # "b" is now the least recently used
+        load("c")
+        load("a")
+        load("b")
+    assert calls == ["a", "b", "c", "b"]
+
+
+def test_clear_query_caches(mock_fs_db: Path) -> None:
+    """Test that clear_query_caches and close_connections force cached loaders to rerun."""
+    calls = []
+
+    @connection.cached_for_fs_db
+    def load() -> int:
+        calls.append(1)
+        return len(calls)
+
+    with patch.object(connection, "FS_CACHE_PATH", mock_fs_db):
+        assert load() == 1
+        connection.clear_query_caches()
+        assert load() == 2
+        connection.close_connections()
+        assert load() == 3
+
+
+def test_cache_databases_not_modified_by_default(mock_fs_db: Path) -> None:
+    """Test that opening the cache leaves its journal mode and schema alone."""
+    with patch.object(connection, "FS_CACHE_PATH", mock_fs_db):
+        conn = connection.get_fs_db()
+        connection.fs_db_version()
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+        indexes = conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'").fetchall()
+        assert not [name for (name,) in indexes if name.startswith("idx_analyzer")]
+
+        connection.close_connections()
+
+
+def test_prepare_cache_databases_opt_in(mock_fs_db: Path, mock_sources_db: Path) -> None:
+    """Test that opting in switches both cache databases to WAL."""
+    with (
+        patch.object(connection, "PREPARE_CACHE_DATABASES", True),
+        patch.object(connection, "FS_CACHE_PATH", mock_fs_db),
+        patch.object(connection, "SOURCES_CACHE_PATH", mock_sources_db),
+    ):
+        for conn in (connection.get_fs_db(), connection.get_sources_db()):
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert conn.execute("PRAGMA query_only").fetchone()[0] == 1
+
+        connection.close_connections()
+
+
+@pytest.mark.parametrize("prepare", [False, True])
+def test_fs_db_version_stable_across_first_open(mock_fs_db: Path, prepare: bool) -> None:
+    """Test that our own setup and reader open do not look like a database change."""
+    with (
+        patch.object(connection, "PREPARE_CACHE_DATABASES", prepare),
+        patch.object(connection, "FS_CACHE_PATH", mock_fs_db),
+    ):
+        before = connection.fs_db_version()
+        connection.get_fs_db().execute("SELECT COUNT(*) FROM persons").fetchone()
+        assert connection.fs_db_version() == before
+
+        connection.close_connections()
+
+
+def test_pinned_fs_db_version(mock_fs_db: Path) -> None:
+    """Test that a pinned version is checked once and released on exit."""
+    with patch.object(connection, "FS_CACHE_PATH", mock_fs_db):
+        with connection.pinned_fs_db_version() as pinned:
+            conn = sqlite3.connect(str(mock_fs_db))
+            conn.execute("INSERT INTO persons VALUES ('TEST-456', 'Another Person')")
+            conn.commit()
+            conn.close()
+            assert connection.fs_db_version() == pinned
+            with connection.pinned_fs_db_version() as nested:
+                assert nested == pinned
+
+        assert connection.fs_db_version() != pinned
+
+
+def test_thread_connection_closed_when_thread_exits(mock_fs_db: Path) -> None:
+    """Test that a short-lived thread's connection is closed and forgotten when it exits."""
+    opened: list[sqlite3.Connection] = []
+
+    def query() -> None:
+        conn = connection.get_fs_db()
+        conn.execute("SELECT 1").fetchone()
+        opened.append(conn)
+
+    with patch.object(connection, "FS_CACHE_PATH", mock_fs_db):
+        for _ in range(3):
+            thread = threading.Thread(target=query)
+            thread.start()
+            thread.join()
+            assert len(connection._open_connections) == 0
+
+        assert len(opened) == 3
+        for conn in opened:
+            with pytest.raises(sqlite3.ProgrammingError):
+                conn.execute("SELECT 1")
+
+        connection.close_connections()
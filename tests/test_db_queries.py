@@ -1,7 +1,9 @@
 """Tests for database queries module."""
 
 import sqlite3
+from collections.abc import Callable, Iterator
 from pathlib import Path
+from typing import Any
 from unittest.mock import patch
 
 import pytest
@@ -9,11 +11,10 @@ import pytest
 from db import connection, queries
 
 
-@pytest.fixture
-def test_db(tmp_path: Path) -> Path:
-    """Create a test database with schema and sample data."""
-    db_path = tmp_path / "test_cache.sqlite"
-    conn = sqlite3.connect(str(db_path))
+@pytest.fixture(scope="module")
+def template_db() -> Iterator[sqlite3.Connection]:
+    """Build the schema and sample data once, in memory, for test_db to copy."""
+    conn = sqlite3.connect(":memory:")
 
     # Create schema
     conn.executescript("""
@@ -67,13 +68,16 @@ def test_db(tmp_path: Path) -> Path:
         );
     """)
 
-    # Insert test data
+    # Insert test data, in one transaction
     conn.executescript("""
+        BEGIN;
+
         -- Test persons
-        INSERT INTO persons VALUES ('P1', 'John Doe', 'M', '{}');
-        INSERT INTO persons VALUES ('P2', 'Jane Smith', 'F', '{}');
-        INSERT INTO persons VALUES ('P3', 'Bob Johnson', 'M', '{}');
-        INSERT INTO persons VALUES ('P4', 'Alice Doe', 'F', '{}');
+        INSERT INTO persons VALUES
+            ('P1', 'John Doe', 'M', '{}'),
+            ('P2', 'Jane Smith', 'F', '{}'),
+            ('P3', 'Bob Johnson', 'M', '{}'),
+            ('P4', 'Alice Doe', 'F', '{}');
 
         -- Names
         INSERT INTO person_names VALUES
@@ -83,23 +87,38 @@ def test_db(tmp_path: Path) -> Path:
             ('P4', 'BirthName', 'Alice', 'Doe', 'alice', 'doe', 'A420', 'D000');
 
         -- Facts
-        INSERT INTO facts VALUES ('P1', 'Birth', 19500101, 'New York');
-        INSERT INTO facts VALUES ('P1', 'Death', 20200101, 'California');
-        INSERT INTO facts VALUES ('P2', 'Birth', 19520315, 'Boston');
+        INSERT INTO facts VALUES
+            ('P1', 'Birth', 19500101, 'New York'),
+            ('P1', 'Death', 20200101, 'California'),
+            ('P2', 'Birth', 19520315, 'Boston');
 
         -- Relationships
-        INSERT INTO parent_child_relationships VALUES ('P1', 'P4', 'father');
-        INSERT INTO parent_child_relationships VALUES ('P2', 'P4', 'mother');
+        INSERT INTO parent_child_relationships VALUES
+            ('P1', 'P4', 'father'),
+            ('P2', 'P4', 'mother');
         INSERT INTO couple_relationships VALUES ('P1', 'P2', '1975-06-01', 'Nevada');
 
         -- Sources
-        INSERT INTO sources VALUES ('S1', 'Birth Certificate');
-        INSERT INTO sources VALUES ('S2', 'Death Certificate');
-        INSERT INTO person_source_refs VALUES ('P1', 'S1', 'Birth');
-        INSERT INTO person_source_refs VALUES ('P1', 'S2', 'Death');
+        INSERT INTO sources VALUES
+            ('S1', 'Birth Certificate'),
+            ('S2', 'Death Certificate');
+        INSERT INTO person_source_refs VALUES
+            ('P1', 'S1', 'Birth'),
+            ('P1', 'S2', 'Death');
+
+        COMMIT;
     """)
 
-    conn.commit()
+    yield conn
+    conn.close()
+
+
+@pytest.fixture
+def test_db(tmp_path: Path, template_db: sqlite3.Connection) -> Path:
+    """Create a test database with schema and sample data."""
+    db_path = tmp_path / "test_cache.sqlite"
+    conn = sqlite3.connect(str(db_path))
+    template_db.backup(conn)
     conn.close()
     return db_path
 
@@ -108,7 +127,6 @@ def test_db(tmp_path: Path) -> Path:
 def mock_db_path(test_db: Path) -> None:
     """Automatically patch the FS_CACHE_PATH for all tests."""
     with patch.object(connection, "FS_CACHE_PATH", test_db):
-        connection._fs_conn = None  # Reset connection
         yield
         connection.close_connections()
 
@@ -242,6 +260,7 @@ def test_get_all_persons_with_names() -> None:
     assert john["surname"] == "Doe"
     assert john["normalized_given"] == "john"
     assert john["soundex_surname"] == "D000"
+    assert john["surname_lower"] == "doe"
 
 
 def test_get_persons_by_surname() -> None:
@@ -285,3 +304,180 @@ def test_get_facts_without_sources() -> None:
     assert birth_fact is not None
     assert birth_fact["fact_type"] == "Birth"
     assert birth_fact["display_name"] == "Jane Smith"
+
+
+@patch.object(connection, "PREPARE_CACHE_DATABASES", True)
+def test_unsourced_queries_probe_source_refs_index() -> None:
+    """Test that the unsourced person/fact anti-joins seek the covering source-ref index."""
+    conn = connection.get_fs_db()
+    statements: list[str] = []
+    conn.set_trace_callback(statements.append)
+    queries.get_persons_without_sources()
+    queries.get_facts_without_sources()
+    conn.set_trace_callback(None)
+
+    assert len(statements) == 2
+    for sql in statements:
+        plan = " ".join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}"))
+        assert "USING COVERING INDEX idx_analyzer_source_refs_person_tag" in plan
+
+
+def test_get_facts_bulk() -> None:
+    """Test getting facts for several persons in one call."""
+    facts = queries.get_facts_bulk(["P1", "P2", "P4"])
+    assert set(facts) == {"P1", "P2", "P4"}
+    assert [f["fact_type"] for f in facts["P1"]] == ["Birth", "Death"]
+    assert facts["P2"][0]["date_sort"] == 19520315
+    assert facts["P4"] == []
+
+
+@pytest.mark.parametrize(
+    ("bulk_getter", "p1_rows"),
+    [
+        (queries.get_facts_bulk, 2),
+        (queries.get_person_names_bulk, 1),
+        (queries.get_sources_bulk, 2),
+    ],
+)
+def test_bulk_getters_chunk_large_id_lists(
+    bulk_getter: Callable[[list[str]], dict[str, list[dict[str, Any]]]], p1_rows: int
+) -> None:
+    """Test that bulk lookups split ID lists larger than SQLite's parameter limit."""
+    ids = ["P1"] + [f"MISSING{i}" for i in range(2 * queries.MAX_QUERY_PARAMS)]
+    rows = bulk_getter(ids)
+    assert len(rows) == len(ids)
+    assert len(rows["P1"]) == p1_rows
+
+
+def test_get_parents_bulk() -> None:
+    """Test getting parents for several persons in one call."""
+    parents = queries.get_parents_bulk(["P4", "P1"])
+    assert {p["person_id"] for p in parents["P4"]} == {"P1", "P2"}
+    assert {p["parent_role"] for p in parents["P4"]} == {"father", "mother"}
+    assert parents["P1"] == []
+
+
+def test_get_spouses_bulk() -> None:
+    """Test getting spouses for several persons, in both directions of the couple."""
+    spouses = queries.get_spouses_bulk(["P1", "P2", "P3"])
+    assert [s["person_id"] for s in spouses["P1"]] == ["P2"]
+    assert [s["person_id"] for s in spouses["P2"]] == ["P1"]
+    assert spouses["P1"][0]["marriage_place"] == "Nevada"
+    assert spouses["P3"] == []
+
+
+def test_relative_names_bulk() -> None:
+    """Test getting only relatives' display names for several persons."""
+    ids = ["P1", "P2", "P3"]
+    parents = queries.get_parents_bulk(ids)
+    spouses = queries.get_spouses_bulk(ids)
+    assert queries.get_parent_names_bulk(ids) == {
+        pid: [p["display_name"] for p in parents[pid]] for pid in ids
+    }
+    assert queries.get_spouse_names_bulk(ids) == {
+        pid: [s["display_name"] for s in spouses[pid]] for pid in ids
+    }
+
+
+def test_get_children_bulk() -> None:
+    """Test getting children for several persons in one call."""
+    children = queries.get_children_bulk(["P1", "P2", "P3"])
+    assert [c["person_id"] for c in children["P1"]] == ["P4"]
+    assert children["P2"][0]["parent_role"] == "mother"
+    assert children["P3"] == []
+
+
+def test_get_all_parent_edges() -> None:
+    """Test getting every child/parent edge."""
+    edges = queries.get_all_parent_edges()
+    assert sorted(edges) == [("P4", "P1"), ("P4", "P2")]
+
+
+def test_get_all_parent_edges_skips_missing_parents(test_db: Path) -> None:
+    """Test that edges to a parent not in persons are left out, as get_parents does."""
+    conn = sqlite3.connect(str(test_db))
+    conn.execute("INSERT INTO parent_child_relationships VALUES ('GONE', 'P4', 'father')")
+    conn.commit()
+    conn.close()
+
+    edges = queries.get_all_parent_edges()
+    assert sorted(edges) == [("P4", "P1"), ("P4", "P2")]
+    assert [p["person_id"] for p in queries.get_parents("P4")] == [pid for _, pid in edges]
+
+
+def test_get_vital_facts() -> None:
+    """Test getting Birth/Death facts for everyone keyed by person and type."""
+    facts = queries.get_vital_facts()
+    assert set(facts) == {"P1", "P2"}
+    assert set(facts["P1"]) == {"Birth", "Death"}
+    assert facts["P1"]["Death"]["date_sort"] == 20200101
+    assert set(facts["P2"]) == {"Birth"}
+
+
+def test_get_all_persons_with_names_surname_contains() -> None:
+    """Test filtering persons by a case-insensitive surname substring."""
+    persons = queries.get_all_persons_with_names(surname_contains="DO")
+    assert {p["surname"] for p in persons} == {"Doe"}
+    assert queries.get_all_persons_with_names(surname_contains="d%e") == []
+
+
+def test_get_sources_bulk() -> None:
+    """Test getting sources for several persons in one call."""
+    sources = queries.get_sources_bulk(["P1", "P3"])
+    assert sources["P1"] == queries.get_person_sources("P1")
+    assert sources["P3"] == []
+
+
+def test_get_source_counts_bulk() -> None:
+    """Test counting sources for several persons in one call."""
+    counts = queries.get_source_counts_bulk(["P1", "P3"])
+    assert counts == {"P1": len(queries.get_person_sources("P1")), "P3": 0}
+
+
+@patch.object(connection, "PREPARE_CACHE_DATABASES", True)
+def test_lookup_indexes_created() -> None:
+    """Test that opting in adds indexes for the per-person lookups."""
+    conn = connection.get_fs_db()
+    indexes = {
+        row["name"] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+    }
+    assert {
+        "idx_analyzer_facts_person",
+        "idx_analyzer_pcr_child",
+        "idx_analyzer_names_surname",
+        "idx_analyzer_source_refs_person_tag",
+    } <= indexes
+
+
+def test_get_all_persons_with_names_fills_missing_soundex(test_db: Path) -> None:
+    """Test that names cached without a Soundex code get one computed."""
+    conn = sqlite3.connect(str(test_db))
+    conn.execute("UPDATE person_names SET soundex_surname = NULL WHERE person_id = 'P1'")
+    conn.commit()
+    conn.close()
+
+    persons = queries.get_all_persons_with_names()
+    john = next(p for p in persons if p["person_id"] == "P1")
+    assert john["soundex_surname"] == "D000"
+
+
+def test_get_persons_bulk() -> None:
+    """Test getting several persons at once."""
+    persons = queries.get_persons_bulk(["P1", "P2", "NOPE"])
+    assert set(persons) == {"P1", "P2"}
+    assert persons["P1"] == queries.get_person_by_id("P1")
+
+
+def test_get_person_names_bulk() -> None:
+    """Test getting name forms for several persons at once."""
+    names = queries.get_person_names_bulk(["P1", "NOPE"])
+    assert names["P1"] == queries.get_person_names("P1")
+    assert names["NOPE"] == []
+
+
+def test_get_all_persons() -> None:
+    """Test getting every person as plain dicts, ordered by ID."""
+    persons = queries.get_all_persons()
+    assert [p["person_id"] for p in persons] == sorted(p["person_id"] for p in persons)
+    assert type(persons[0]) is dict
+    assert persons[0] == queries.get_person_by_id(persons[0]["person_id"])
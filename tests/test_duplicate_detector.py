@@ -4,9 +4,12 @@ import sqlite3
 from pathlib import Path
 from unittest.mock import patch
 
+import numpy as np
 import pytest
 
+from analysis import duplicate_detector
 from analysis.duplicate_detector import find_likely_duplicates
+from analysis.name_disambiguation import CandidatePairs
 from db import connection
 
 
@@ -16,7 +19,9 @@ def dup_db(tmp_path: Path) -> Path:
     db_path = tmp_path / "dup.sqlite"
     conn = sqlite3.connect(str(db_path))
 
+    # Schema and data in one transaction
     conn.executescript("""
+        BEGIN;
         CREATE TABLE persons (person_id TEXT PRIMARY KEY, display_name TEXT, gender TEXT);
         CREATE TABLE person_names (person_id TEXT, name_type TEXT, given_name TEXT, surname TEXT,
             normalized_given TEXT, normalized_surname TEXT, soundex_given TEXT, soundex_surname TEXT);
@@ -31,9 +36,9 @@ def dup_db(tmp_path: Path) -> Path:
             ('P2', 'BirthName', 'John', 'Doe', 'john', 'doe', 'J500', 'D000'),
             ('P3', 'BirthName', 'Jane', 'Smith', 'jane', 'smith', 'J500', 'S530');
         INSERT INTO facts VALUES ('P1', 'Birth', 19500101, 'California'), ('P2', 'Birth', 19500101, 'California');
+        COMMIT;
     """)
 
-    conn.commit()
     conn.close()
     return db_path
 
@@ -42,7 +47,6 @@ def dup_db(tmp_path: Path) -> Path:
 def mock_dup_db(dup_db: Path) -> None:
     """Auto-patch database."""
     with patch.object(connection, "FS_CACHE_PATH", dup_db):
-        connection._fs_conn = None
         yield
         connection.close_connections()
 
@@ -76,3 +80,39 @@ def test_find_likely_duplicates_low_threshold() -> None:
 
     assert isinstance(duplicates, list)
     # Low threshold should find more pairs
+
+
+def test_find_likely_duplicates_limit() -> None:
+    """Test that a limit returns the head of the full ranking."""
+    duplicates = find_likely_duplicates(threshold=0.20)
+    assert find_likely_duplicates(threshold=0.20, limit=1) == duplicates[:1]
+
+
+def test_find_likely_duplicates_reuses_grouping_across_thresholds() -> None:
+    """Test that runs at different thresholds prefetch the candidates only once."""
+    with patch(
+        "analysis.duplicate_detector.build_similarity_context",
+        wraps=duplicate_detector.build_similarity_context,
+    ) as build:
+        assert len(find_likely_duplicates(threshold=0.20)) == 1
+        assert len(find_likely_duplicates(threshold=0.99)) == 0
+    assert build.call_count == 1
+
+
+def test_find_likely_duplicates_ranks_on_displayed_score() -> None:
+    """Test that pairs showing the same rounded score keep the order they were found in."""
+    persons = [{"person_id": f"P{k}", "display_name": f"Person {k}"} for k in range(3)]
+    scored = CandidatePairs(
+        np.array([0, 0, 1]), np.array([1, 2, 2]), np.array([0.9001, 0.9004, 0.95])
+    )
+    with (
+        patch.object(duplicate_detector, "_name_groups", return_value=(persons, [[0, 1, 2]], None)),
+        patch.object(duplicate_detector, "score_candidate_pairs", return_value=scored),
+    ):
+        duplicates = find_likely_duplicates()
+
+    assert [(d["person1_id"], d["person2_id"], d["similarity_score"]) for d in duplicates] == [
+        ("P1", "P2", 0.95),
+        ("P0", "P1", 0.9),
+        ("P0", "P2", 0.9),
+    ]
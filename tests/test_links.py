@@ -76,3 +76,12 @@ def test_search_url_parameter_order() -> None:
     params = params_part.split("&")
     assert params[0] == "givenName=John"
     assert params[1] == "surname=Smith"
+
+
+def test_search_url_encodes_values() -> None:
+    """Test that spaces and commas in parameters are URL-encoded."""
+    url = search_url(surname="De la Cruz", birth_place="Guadalajara, Jalisco")
+    assert url == (
+        "https://www.familysearch.org/search/tree/results"
+        "?surname=De+la+Cruz&birthLikePlace=Guadalajara%2C+Jalisco"
+    )
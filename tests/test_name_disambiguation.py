@@ -1,22 +1,31 @@
 """Tests for name disambiguation module."""
 
+import random
 import sqlite3
 from pathlib import Path
 from unittest.mock import patch
 
 import pytest
 
-from analysis.name_disambiguation import compute_similarity_score, detect_name_clusters
+from analysis import name_disambiguation
+from analysis.name_disambiguation import (
+    build_similarity_context,
+    compute_similarity_score,
+    detect_name_clusters,
+    score_candidate_pairs,
+)
 from db import connection
 
 
-@pytest.fixture
-def name_test_db(tmp_path: Path) -> Path:
+@pytest.fixture(scope="module")
+def name_test_db(tmp_path_factory: pytest.TempPathFactory) -> Path:
     """Create a test database with persons having similar names."""
-    db_path = tmp_path / "name_test.sqlite"
+    db_path = tmp_path_factory.mktemp("names") / "name_test.sqlite"
     conn = sqlite3.connect(str(db_path))
 
+    # Schema and data in one transaction
     conn.executescript("""
+        BEGIN;
         CREATE TABLE persons (
             person_id TEXT PRIMARY KEY,
             display_name TEXT,
@@ -76,22 +85,28 @@ def name_test_db(tmp_path: Path) -> Path:
             ('P2', 'Birth', 19500315, 'California'),
             ('P3', 'Birth', 19600101, 'Mexico'),
             ('P4', 'Birth', 19590901, 'Mexico');
+        COMMIT;
     """)
 
-    conn.commit()
     conn.close()
     return db_path
 
 
-@pytest.fixture(autouse=True)
+@pytest.fixture(scope="module", autouse=True)
 def mock_name_db(name_test_db: Path) -> None:
-    """Automatically patch the database for name tests."""
+    """Automatically patch the database for name tests. The tests only read it, so they share one connection."""
     with patch.object(connection, "FS_CACHE_PATH", name_test_db):
-        connection._fs_conn = None
         yield
         connection.close_connections()
 
 
+@pytest.fixture(autouse=True)
+def fresh_query_caches() -> None:
+    """Drop cached query results after each test, keeping the connection open."""
+    yield
+    connection.clear_query_caches()
+
+
 def test_compute_similarity_score_exact_match() -> None:
     """Test similarity score for exact matches."""
     person1 = {"person_id": "P1", "normalized_surname": "smith", "normalized_given": "john"}
@@ -132,6 +147,82 @@ def test_compute_similarity_score_missing_names() -> None:
     assert 0.0 <= score <= 1.0
 
 
+def test_build_similarity_context_arrays() -> None:
+    """Test that the context extracts years and encodes birth places per person."""
+    ctx = build_similarity_context(["P1", "P2", "P3", "P9"])
+
+    p1, p2, p3, p9 = (ctx.positions[pid] for pid in ("P1", "P2", "P3", "P9"))
+    assert ctx.birth_year[p1] == 1950
+    assert ctx.birth_sort[p2] == 19500315
+    assert ctx.death_year[p1] == 0
+    assert ctx.birth_place_code[p1] == ctx.birth_place_code[p2]
+    assert ctx.birth_place_code[p1] != ctx.birth_place_code[p3]
+    assert ctx.birth_place_code[p9] == -1
+    assert ctx.birth_year[p9] == 0
+
+
+def test_score_candidate_pairs_matches_pairwise_score() -> None:
+    """Test that block scoring gives the same scores as scoring each pair."""
+    persons = [
+        {"person_id": "P1", "normalized_surname": "smith", "normalized_given": "john"},
+        {"person_id": "P2", "normalized_surname": "smith", "normalized_given": "john"},
+        {"person_id": "P3", "normalized_surname": "garcia", "normalized_given": "jose"},
+        {"person_id": "P4", "normalized_surname": "garcia", "normalized_given": "joseph"},
+    ]
+
+    pairs = score_candidate_pairs(persons, threshold=0.10)
+
+    assert len(pairs.scores) > 0
+    for i, j, score in zip(*pairs, strict=True):
+        assert score == pytest.approx(compute_similarity_score(persons[i], persons[j]))
+
+
+def test_score_candidate_pairs_relatives_overlap() -> None:
+    """Test that block scoring credits shared parents and spouses like pairwise scoring."""
+    persons = [
+        {"person_id": pid, "normalized_surname": "smith", "normalized_given": "john"}
+        for pid in ("P1", "P2", "P3", "P4")
+    ]
+    ids = [p["person_id"] for p in persons]
+
+    ctx = build_similarity_context(
+        ids,
+        parent_names={"P1": ["Ann", "Bob"], "P2": ["Ann"], "P3": ["Ann", "Bob"], "P4": []},
+        spouse_names={"P1": ["Eve"], "P2": ["Eve", "Kim"], "P3": [], "P4": ["Eve"]},
+    )
+
+    pairs = score_candidate_pairs(persons, threshold=0.0, ctx=ctx)
+
+    assert len(pairs.scores) == 6
+    for i, j, score in zip(*pairs, strict=True):
+        assert score == compute_similarity_score(persons[i], persons[j], ctx)
+
+
+def test_score_candidate_pairs_applies_threshold() -> None:
+    """Test that block scoring only returns pairs at or above the threshold."""
+    persons = [
+        {"person_id": "P1", "normalized_surname": "smith", "normalized_given": "john"},
+        {"person_id": "P3", "normalized_surname": "garcia", "normalized_given": "jose"},
+    ]
+
+    assert len(score_candidate_pairs(persons, threshold=0.90).scores) == 0
+
+
+def test_score_candidate_pairs_across_blocks() -> None:
+    """Test that scoring one block against another pairs every left/right person."""
+    left = [{"person_id": "P3", "normalized_surname": "garcia", "normalized_given": "jose"}]
+    right = [
+        {"person_id": "P4", "normalized_surname": "garcia", "normalized_given": "joseph"},
+        {"person_id": "P1", "normalized_surname": "smith", "normalized_given": "john"},
+    ]
+
+    pairs = score_candidate_pairs(left, threshold=0.0, others=right)
+
+    assert set(zip(pairs.first.tolist(), pairs.second.tolist(), strict=True)) == {(0, 0), (0, 1)}
+    for i, j, score in zip(*pairs, strict=True):
+        assert score == pytest.approx(compute_similarity_score(left[i], right[j]))
+
+
 def test_detect_name_clusters() -> None:
     """Test detecting name duplicate clusters."""
     clusters = detect_name_clusters(surname_filter=None, similarity_threshold=0.40)
@@ -148,6 +239,136 @@ def test_detect_name_clusters() -> None:
     assert len(cluster["persons"]) >= 2
 
 
+def test_detect_name_clusters_across_decade_boundary() -> None:
+    """Test that births in adjacent decades (1959 vs 1960) are still compared."""
+    clusters = detect_name_clusters(surname_filter="Garcia", similarity_threshold=0.40)
+
+    assert [sorted(p["person_id"] for p in c["persons"]) for c in clusters] == [["P3", "P4"]]
+
+
+def test_cluster_pairs_representative_is_first_in_tree_order() -> None:
+    """Test that clusters are scored against their earliest member, whatever the pair order."""
+    persons = [
+        {"person_id": pid, "display_name": name, "given_name": name.split()[0], "surname": "Lopez"}
+        for pid, name in [
+            ("A", "Juan Lopez"),
+            ("B", "Jose Lopez"),
+            ("C", "Juana Lopez"),
+            ("D", "Maria Lopez"),
+            ("E", "Mario Lopez"),
+        ]
+    ]
+    pairs = [("E", "D", 0.9), ("C", "B", 0.8), ("B", "A", 0.7)]
+    person_map = {p["person_id"]: p for p in persons}
+
+    for ordered in (pairs, pairs[::-1]):
+        clusters = name_disambiguation._cluster_pairs(ordered, persons)
+
+        assert [c["size"] for c in clusters] == [3, 2]
+        for cluster, root in zip(clusters, ["A", "D"], strict=True):
+            scores = {p["person_id"]: p["similarity_score"] for p in cluster["persons"]}
+            assert scores.pop(root) == 1.0
+            for pid, score in scores.items():
+                expected = compute_similarity_score(person_map[root], person_map[pid])
+                assert score == round(expected, 3)
+
+
+def test_split_block_scoring_matches_full_block(tmp_path: Path) -> None:
+    """Test that splitting a Soundex block by birth decade keeps every pair a full comparison finds."""
+    rng = random.Random(0)
+    db_path = tmp_path / "recall.sqlite"
+    conn = sqlite3.connect(str(db_path))
+    conn.executescript("""
+        CREATE TABLE persons (person_id TEXT PRIMARY KEY, display_name TEXT, gender TEXT);
+        CREATE TABLE person_names (person_id TEXT, name_type TEXT, given_name TEXT, surname TEXT,
+            normalized_given TEXT, normalized_surname TEXT, soundex_given TEXT, soundex_surname TEXT);
+        CREATE TABLE facts (person_id TEXT, fact_type TEXT, date_sort INTEGER, place_normalized TEXT);
+        CREATE TABLE parent_child_relationships (parent_id TEXT, child_id TEXT, parent_role TEXT);
+        CREATE TABLE couple_relationships (person1_id TEXT, person2_id TEXT,
+            marriage_date TEXT, marriage_place TEXT);
+    """)
+    for k in range(4):
+        conn.execute("INSERT INTO persons VALUES (?, ?, 'M')", (f"PAR{k}", f"Parent {k}"))
+    for k in range(120):
+        person_id = f"R{k}"
+        given = rng.choice(["jose", "josefa", "joseph", "maria", "mariana", "juan"])
+        surname = rng.choice(["ibarra", "ibarra", "ybarra", "ibara"])
+        conn.execute("INSERT INTO persons VALUES (?, ?, 'M')", (person_id, f"{given} {surname}"))
+        conn.execute(
+            "INSERT INTO person_names VALUES (?, 'BirthName', ?, ?, ?, ?, '', 'I160')",
+            (person_id, given, surname, given, surname),
+        )
+        place = rng.choice(["Jalisco", "Sonora"])
+        if rng.random() < 0.85:
+            birth = rng.randint(1850, 1950)
+            conn.execute(
+                "INSERT INTO facts VALUES (?, 'Birth', ?, ?)",
+                (person_id, birth * 10000 + 101, place),
+            )
+        if rng.random() < 0.7:
+            death = rng.choice([1900, 1920, rng.randint(1880, 2000)])
+            conn.execute(
+                "INSERT INTO facts VALUES (?, 'Death', ?, ?)",
+                (person_id, death * 10000 + 101, place),
+            )
+        for parent in rng.sample(range(4), rng.randint(0, 2)):
+            conn.execute(
+                "INSERT INTO parent_child_relationships VALUES (?, ?, 'father')",
+                (f"PAR{parent}", person_id),
+            )
+    conn.commit()
+    conn.close()
+
+    with patch.object(connection, "FS_CACHE_PATH", db_path):
+        (block,) = name_disambiguation._soundex_blocks(None)[1]
+        ctx = build_similarity_context(p["person_id"] for p in block)
+        full = score_candidate_pairs(block, 0.60, ctx)
+        split = name_disambiguation._score_block(block, 0.60, ctx)
+        connection.close_connections()
+
+    expected = {}
+    for i, j, score in zip(*full, strict=True):
+        id1, id2 = sorted((block[i]["person_id"], block[j]["person_id"]))
+        expected[(id1, id2)] = score
+    # The tree has matches whose births are decades apart
+    years = {p["person_id"]: int(ctx.birth_year[ctx.positions[p["person_id"]]]) for p in block}
+    assert any(
+        years[id1] and years[id2] and abs(years[id1] // 10 - years[id2] // 10) > 1
+        for id1, id2 in expected
+    )
+    assert {(id1, id2): score for id1, id2, score in split} == expected
+
+
+def test_detect_name_clusters_parallel_matches_serial() -> None:
+    """Test that scoring blocks in worker processes gives the same clusters."""
+    serial = detect_name_clusters(similarity_threshold=0.40)
+
+    with (
+        patch.object(name_disambiguation, "PARALLEL_MIN_PAIRS", 0),
+        patch("os.cpu_count", return_value=2),
+    ):
+        parallel = detect_name_clusters(similarity_threshold=0.40)
+
+    assert parallel == serial
+
+
+def test_detect_name_clusters_in_worker_process_scores_in_process() -> None:
+    """Test that a run inside a worker process does not start a nested pool."""
+    serial = detect_name_clusters(similarity_threshold=0.40)
+    connection.clear_query_caches()
+
+    with (
+        patch.object(name_disambiguation, "PARALLEL_MIN_PAIRS", 0),
+        patch("os.cpu_count", return_value=2),
+        patch("multiprocessing.parent_process", return_value=object()),
+        patch.object(name_disambiguation, "ProcessPoolExecutor") as pool,
+    ):
+        in_worker = detect_name_clusters(similarity_threshold=0.40)
+
+    pool.assert_not_called()
+    assert in_worker == serial
+
+
 def test_detect_name_clusters_with_surname_filter() -> None:
     """Test detecting clusters with surname filter."""
     clusters = detect_name_clusters(surname_filter="Smith", similarity_threshold=0.40)
@@ -0,0 +1,108 @@
+"""Tests for relationship structure validation."""
+
+import sqlite3
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from analysis.relationship_checker import (
+    detect_circular_ancestry,
+    load_parent_graph,
+    validate_relationships_for_tree,
+)
+from db import connection
+
+
+@pytest.fixture
+def relationship_db(tmp_path: Path) -> Path:
+    """Create test database with a circular ancestry loop."""
+    db_path = tmp_path / "relationships.sqlite"
+    conn = sqlite3.connect(str(db_path))
+
+    # Schema and data in one transaction
+    conn.executescript("""
+        BEGIN;
+        CREATE TABLE persons (person_id TEXT PRIMARY KEY, display_name TEXT, gender TEXT);
+        CREATE TABLE parent_child_relationships (parent_id TEXT, child_id TEXT, parent_role TEXT);
+        CREATE TABLE couple_relationships (person1_id TEXT, person2_id TEXT, marriage_date TEXT, marriage_place TEXT);
+
+        INSERT INTO persons VALUES
+            ('P1', 'Child', 'M'), ('P2', 'Father', 'M'), ('P3', 'Grandfather', 'M'),
+            ('P4', 'Mother', 'F'), ('P5', 'Unrelated', 'F');
+
+        -- P1 <- P2 <- P3 <- P2 (P2 and P3 are each other's ancestors)
+        INSERT INTO parent_child_relationships VALUES
+            ('P2', 'P1', 'father'), ('P4', 'P1', 'mother'),
+            ('P3', 'P2', 'father'), ('P2', 'P3', 'father');
+        INSERT INTO couple_relationships VALUES ('P2', 'P4', '1950', 'Texas');
+        COMMIT;
+    """)
+
+    conn.close()
+    return db_path
+
+
+@pytest.fixture(autouse=True)
+def mock_relationship_db(relationship_db: Path) -> None:
+    """Auto-patch database."""
+    with patch.object(connection, "FS_CACHE_PATH", relationship_db):
+        yield
+        connection.close_connections()
+
+
+def test_load_parent_graph_marks_descendants_of_cycle() -> None:
+    """Test that the graph flags everyone with a cycle among their ancestors."""
+    graph = load_parent_graph()
+
+    flagged = {pid for pid in graph.ids if graph.reaches_cycle[graph.positions[pid]]}
+    assert flagged == {"P1", "P2", "P3"}
+
+
+def test_detect_circular_ancestry_reports_cycle() -> None:
+    """Test detecting a person whose ancestors loop back on themselves."""
+    issues = detect_circular_ancestry("P1")
+
+    assert len(issues) == 1
+    assert issues[0]["type"] == "circular_ancestry"
+    assert issues[0]["severity"] == "critical"
+    assert issues[0]["cycle"] == ["P2", "P3", "P2"]
+
+
+def test_detect_circular_ancestry_via_longer_path_first(relationship_db: Path) -> None:
+    """Test that a cycle is found when it is first reached along a path too long to close it."""
+    conn = sqlite3.connect(str(relationship_db))
+    # P6's first parent reaches P2 in three generations, its second parent is P2 itself
+    conn.executescript("""
+        INSERT INTO persons VALUES ('P6', 'Grandchild', 'F'), ('P7', 'Step', 'M'), ('P8', 'Step', 'M');
+        INSERT INTO parent_child_relationships VALUES
+            ('P7', 'P6', 'father'), ('P2', 'P6', 'father'),
+            ('P8', 'P7', 'father'), ('P2', 'P8', 'father');
+    """)
+    conn.close()
+
+    issues = detect_circular_ancestry("P6", max_depth=3)
+
+    assert len(issues) == 1
+    assert issues[0]["cycle"] == ["P2", "P3", "P2"]
+
+
+def test_detect_circular_ancestry_no_cycle() -> None:
+    """Test that persons outside the loop are not flagged."""
+    assert detect_circular_ancestry("P4") == []
+    assert detect_circular_ancestry("P5") == []
+
+
+def test_validate_relationships_for_tree() -> None:
+    """Test validating every person reachable from the root."""
+    issues = validate_relationships_for_tree("P1")
+
+    circular = {i["person_id"] for i in issues if i["type"] == "circular_ancestry"}
+    assert circular == {"P1", "P2", "P3"}
+
+
+def test_validate_relationships_for_tree_respects_max_persons() -> None:
+    """Test that the traversal stops after max_persons persons."""
+    issues = validate_relationships_for_tree("P1", max_persons=1)
+
+    assert {i["person_id"] for i in issues} == {"P1"}
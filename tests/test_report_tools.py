@@ -1,5 +1,7 @@
 """Tests for report generation tools."""
 
+import os
+import re
 import sqlite3
 from pathlib import Path
 from unittest.mock import patch
@@ -7,7 +9,12 @@ from unittest.mock import patch
 import pytest
 
 from db import connection
-from tools.report_tools import tool_generate_person_profile
+from reports import generator
+from tools.report_tools import (
+    tool_generate_audit_report,
+    tool_generate_person_profile,
+    tool_generate_report_bundle,
+)
 
 
 @pytest.fixture
@@ -16,7 +23,9 @@ def report_db(tmp_path: Path) -> Path:
     db_path = tmp_path / "report.sqlite"
     conn = sqlite3.connect(str(db_path))
 
+    # Schema and data in one transaction
     conn.executescript("""
+        BEGIN;
         CREATE TABLE persons (person_id TEXT PRIMARY KEY, display_name TEXT, gender TEXT);
         CREATE TABLE person_names (person_id TEXT, name_type TEXT, given_name TEXT, surname TEXT,
             normalized_given TEXT, normalized_surname TEXT, soundex_given TEXT, soundex_surname TEXT);
@@ -32,18 +41,20 @@ def report_db(tmp_path: Path) -> Path:
         INSERT INTO facts VALUES ('P1', 'Birth', 19500101, 'California');
         INSERT INTO sources VALUES ('S1', 'Birth Certificate');
         INSERT INTO person_source_refs VALUES ('P1', 'S1', 'Birth');
+        COMMIT;
     """)
 
-    conn.commit()
     conn.close()
     return db_path
 
 
 @pytest.fixture(autouse=True)
-def mock_report_db(report_db: Path) -> None:
-    """Auto-patch database."""
-    with patch.object(connection, "FS_CACHE_PATH", report_db):
-        connection._fs_conn = None
+def mock_report_db(report_db: Path, tmp_path: Path) -> None:
+    """Auto-patch database and report output directory."""
+    with (
+        patch.object(connection, "FS_CACHE_PATH", report_db),
+        patch.object(generator, "OUTPUT_DIR", tmp_path),
+    ):
         yield
         connection.close_connections()
 
@@ -58,3 +69,75 @@ def test_tool_generate_person_profile() -> None:
     assert isinstance(result["output_file"], str)
     assert result["output_file"].endswith(".md")
     assert "message" in result
+
+
+def test_tool_generate_person_profile_reuses_unchanged_profile() -> None:
+    """Test that a profile is not rendered again while the database is unchanged."""
+    with patch("reports.generator._write_report", wraps=generator._write_report) as write:
+        first = tool_generate_person_profile(person_id="P1")["output_file"]
+        second = tool_generate_person_profile(person_id="P1")["output_file"]
+    assert first == second
+    assert write.call_count == 1
+
+
+def test_tool_generate_person_profile_renders_missing_or_older_file() -> None:
+    """Test that a deleted profile, or one replaced by an older file, is rendered again."""
+    with patch("reports.generator._write_report", wraps=generator._write_report) as write:
+        output_file = Path(tool_generate_person_profile(person_id="P1")["output_file"])
+        output_file.unlink()
+        tool_generate_person_profile(person_id="P1")
+        mtime_ns = output_file.stat().st_mtime_ns - 1_000_000_000
+        os.utime(output_file, ns=(mtime_ns, mtime_ns))
+        tool_generate_person_profile(person_id="P1")
+    assert output_file.exists()
+    assert write.call_count == 3
+
+
+def test_tool_generate_audit_report_reuses_connections() -> None:
+    """Test that repeated audits do not leave more open connections behind."""
+    # One connection for this thread plus at most one per analysis worker; the pool
+    # starts its workers lazily, so the first audits may not use all of them
+    limit = 1 + generator.ANALYSIS_WORKERS
+    for _ in range(5):
+        tool_generate_audit_report(root_person_id="P1")
+        assert len(connection._open_connections) <= limit
+
+
+def test_tool_generate_audit_report_checks_version_once_when_pinned() -> None:
+    """Test that the audit's worker threads share the caller's pinned database version."""
+    with (
+        patch.object(
+            connection, "_check_fs_db_version", wraps=connection._check_fs_db_version
+        ) as check,
+        connection.pinned_fs_db_version(),
+    ):
+        tool_generate_audit_report(root_person_id="P1")
+
+    assert check.call_count == 1
+
+
+def _bundle_reports(output_dir: Path, cpu_count: int) -> dict[str, str]:
+    """Generate a bundle into output_dir and read back each report, timestamps removed."""
+    output_dir.mkdir()
+    with (
+        patch.object(generator, "OUTPUT_DIR", output_dir),
+        patch("tools.report_tools.os.cpu_count", return_value=cpu_count),
+    ):
+        output_files = tool_generate_report_bundle(root_person_id="P1")["output_files"]
+
+    reports = {}
+    for name, output_file in output_files.items():
+        assert Path(output_file).parent == output_dir
+        text = Path(output_file).read_text()
+        reports[name] = re.sub(r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(\.\d+)?", "", text)
+    return reports
+
+
+def test_tool_generate_report_bundle(tmp_path: Path) -> None:
+    """Test that worker processes write the same reports as generating them serially."""
+    serial = _bundle_reports(tmp_path / "serial", cpu_count=1)
+    parallel = _bundle_reports(tmp_path / "parallel", cpu_count=2)
+
+    assert set(serial) == {"audit_report", "research_leads", "name_clusters", "person_profile"}
+    assert "Test Person" in serial["person_profile"]
+    assert parallel == serial
@@ -16,7 +16,9 @@ def source_db(tmp_path: Path) -> Path:
     db_path = tmp_path / "source.sqlite"
     conn = sqlite3.connect(str(db_path))
 
+    # Schema and data in one transaction
     conn.executescript("""
+        BEGIN;
         CREATE TABLE persons (person_id TEXT PRIMARY KEY, display_name TEXT, gender TEXT);
         CREATE TABLE person_names (person_id TEXT, name_type TEXT, given_name TEXT, surname TEXT,
             normalized_given TEXT, normalized_surname TEXT, soundex_given TEXT, soundex_surname TEXT);
@@ -36,9 +38,9 @@ def source_db(tmp_path: Path) -> Path:
         INSERT INTO sources VALUES ('S1', 'Birth Certificate');
         INSERT INTO person_source_refs VALUES ('P1', 'S1', 'Birth');
         INSERT INTO parent_child_relationships VALUES ('P1', 'P2', 'father');
+        COMMIT;
     """)
 
-    conn.commit()
     conn.close()
     return db_path
 
@@ -47,7 +49,6 @@ def source_db(tmp_path: Path) -> Path:
 def mock_source_db(source_db: Path) -> None:
     """Auto-patch database."""
     with patch.object(connection, "FS_CACHE_PATH", source_db):
-        connection._fs_conn = None
         yield
         connection.close_connections()
 
@@ -82,3 +83,11 @@ def test_prioritize_source_research() -> None:
         assert "person_id" in priority
         assert "priority_score" in priority
         assert isinstance(priority["priority_score"], (int, float))
+
+
+def test_prioritize_source_research_limit() -> None:
+    """Test that a limit returns the head of the full ranking."""
+    priorities = prioritize_source_research(root_person_id="P1", generations=2)
+    assert prioritize_source_research(root_person_id="P1", generations=2, limit=1) == (
+        priorities[:1]
+    )
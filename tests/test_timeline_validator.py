@@ -10,13 +10,15 @@ from analysis.timeline_validator import validate_all_timelines, validate_person_
 from db import connection
 
 
-@pytest.fixture
-def timeline_db(tmp_path: Path) -> Path:
+@pytest.fixture(scope="module")
+def timeline_db(tmp_path_factory: pytest.TempPathFactory) -> Path:
     """Create test database with timeline issues."""
-    db_path = tmp_path / "timeline.sqlite"
+    db_path = tmp_path_factory.mktemp("timeline") / "timeline.sqlite"
     conn = sqlite3.connect(str(db_path))
 
+    # Schema and data in one transaction
     conn.executescript("""
+        BEGIN;
         CREATE TABLE persons (person_id TEXT PRIMARY KEY, display_name TEXT, gender TEXT);
         CREATE TABLE person_names (person_id TEXT, name_type TEXT, given_name TEXT, surname TEXT,
             normalized_given TEXT, normalized_surname TEXT, soundex_given TEXT, soundex_surname TEXT);
@@ -39,22 +41,28 @@ def timeline_db(tmp_path: Path) -> Path:
         INSERT INTO facts VALUES ('P3', 'Birth', 20000101, '1 Jan 2000', 'Nevada');
         INSERT INTO facts VALUES ('P4', 'Birth', 19900101, '1 Jan 1990', 'Nevada');
         INSERT INTO parent_child_relationships VALUES ('P3', 'P4', 'mother');
+        COMMIT;
     """)
 
-    conn.commit()
     conn.close()
     return db_path
 
 
-@pytest.fixture(autouse=True)
+@pytest.fixture(scope="module", autouse=True)
 def mock_timeline_db(timeline_db: Path) -> None:
-    """Auto-patch database."""
+    """Auto-patch database. The tests only read it, so they share one connection."""
     with patch.object(connection, "FS_CACHE_PATH", timeline_db):
-        connection._fs_conn = None
         yield
         connection.close_connections()
 
 
+@pytest.fixture(autouse=True)
+def fresh_query_caches() -> None:
+    """Drop cached query results after each test, keeping the connection open."""
+    yield
+    connection.clear_query_caches()
+
+
 def test_validate_person_timeline_valid() -> None:
     """Test validating a person with valid timeline."""
     issues = validate_person_timeline("P1")
@@ -102,3 +110,15 @@ def test_validate_all_timelines_critical_only() -> None:
     # All returned issues should be critical
     for issue in issues:
         assert issue["severity"] == "critical"
+
+
+def test_validate_all_timelines_matches_per_person() -> None:
+    """Test that the bulk validation finds the same issues as per-person validation."""
+    per_person = [
+        issue for pid in ("P1", "P2", "P3", "P4") for issue in validate_person_timeline(pid)
+    ]
+
+    issues = validate_all_timelines(min_severity="info")
+
+    assert sorted(issues, key=repr) == sorted(per_person, key=repr)
+    assert {issue["type"] for issue in issues} == {"death_before_birth", "parent_too_young"}